@@ -9,6 +9,6 @@ if [[ $(python -c "import sys; print(sys.version_info[0])") -lt 3 ]]; then
     alias python="python3"
 fi
 python -m pip install --progress-bar=off numpy scipy cython
-python -m pip install --progress-bar=off pytest pytest-cov
+python -m pip install --progress-bar=off pytest pytest-cov pytest-xdist
 python setup.py build_ext --inplace
-python -m pytest --cov=. --cov-report=xml
+python -m pytest -n auto --full --cov=. --cov-report=xml
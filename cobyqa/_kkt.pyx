@@ -0,0 +1,98 @@
+# cython: boundscheck=False
+# cython: wraparound=False
+# cython: cdivision=True
+# cython: language_level=3
+
+from libc.math cimport fabs
+
+from scipy.linalg.cython_blas cimport drot, drotg  # noqa
+
+# Avoid namespace lookup for NumPy types and array creation methods
+from numpy import empty as np_empty
+from numpy import float64 as np_float64
+
+
+cpdef int givens_sweep(double[:, :] zmat, int knew, int idz):
+    """
+    Put zeros in the `knew`-th row of `zmat` by applying a sequence of Givens
+    rotations, and return the index of the column of `zmat` that holds the
+    remaining nonzero element of the row, other than the first one.
+    """
+    cdef int npt = zmat.shape[0]
+    cdef int inc = zmat.strides[0] // zmat.itemsize
+    cdef int jdz = 0
+    cdef int j
+    cdef double cval, sval, cosv, sinv
+    for j in range(1, zmat.shape[1]):
+        if j == idz:
+            jdz = idz
+        elif fabs(zmat[knew, j]) > 0.0:
+            cval = zmat[knew, jdz]
+            sval = zmat[knew, j]
+            drotg(&cval, &sval, &cosv, &sinv)
+            drot(&npt, &zmat[0, jdz], &inc, &zmat[0, j], &inc, &cosv, &sinv)
+            zmat[knew, j] = 0.0
+    return jdz
+
+
+cpdef double beta_vlag(const double[:, :] xpt, const double[:, :] bmat, const double[:, :] zmat, const double[:] xxopt, const double[:] step, double xoptsq, int idz, int kopt, double[:] vlag):
+    """
+    Evaluate the parameter beta involved in the denominator of the updating
+    formula of the inverse KKT matrix of interpolation, store the values of
+    the Lagrange polynomials and the vector w in `vlag`, and return beta.
+    """
+    cdef Py_ssize_t npt = xpt.shape[0]
+    cdef Py_ssize_t n = xpt.shape[1]
+    cdef Py_ssize_t nz = zmat.shape[1]
+    cdef Py_ssize_t i, j, k
+    cdef double[:] check = np_empty(npt, dtype=np_float64)
+    cdef double[:] temp = np_empty(nz, dtype=np_float64)
+    cdef double stepsq = 0.0
+    cdef double stx = 0.0
+    cdef double beta = 0.0
+    cdef double bneg = 0.0
+    cdef double bsp = 0.0
+    cdef double bspsym = 0.0
+    cdef double xstep, tval, tsym
+    for i in range(n):
+        stepsq += step[i] * step[i]
+        stx += step[i] * xpt[kopt, i]
+    for k in range(npt):
+        xstep = 0.0
+        for i in range(n):
+            xstep += xpt[k, i] * step[i]
+        check[k] = xstep * (0.5 * xstep + xxopt[k])
+    for j in range(nz):
+        tval = 0.0
+        for k in range(npt):
+            tval += zmat[k, j] * check[k]
+        if j < idz:
+            beta += tval * tval
+            tval = -tval
+        else:
+            bneg += tval * tval
+        temp[j] = tval
+    beta -= bneg
+    for k in range(npt):
+        tval = 0.0
+        for i in range(n):
+            tval += bmat[k, i] * step[i]
+        tsym = 0.0
+        for j in range(nz):
+            tsym += zmat[k, j] * temp[j]
+        vlag[k] = tval + tsym
+    vlag[kopt] += 1.0
+    for i in range(n):
+        tval = 0.0
+        for k in range(npt):
+            tval += bmat[k, i] * check[k]
+        bsp += tval * step[i]
+        tsym = 0.0
+        for j in range(n):
+            tsym += bmat[npt + i, j] * step[j]
+        vlag[npt + i] = tval + tsym
+    for i in range(n):
+        bspsym += vlag[npt + i] * step[i]
+    bsp += bspsym
+    beta += stx * stx + stepsq * (xoptsq + 2.0 * stx + 0.5 * stepsq) - bsp
+    return beta
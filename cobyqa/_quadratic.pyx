@@ -0,0 +1,108 @@
+# cython: boundscheck=False
+# cython: wraparound=False
+# cython: cdivision=True
+# cython: language_level=3
+
+# Avoid namespace lookup for NumPy types and array creation methods
+from numpy import empty as np_empty
+from numpy import float64 as np_float64
+
+
+cdef void _hessp(const double[:] pq, const double[:, :] hq, const double[:] x, const double[:, :] xpt, double[:] hx):
+    """
+    Evaluate the product of the Hessian matrix of a quadratic function with a
+    vector, and store the result in `hx`.
+    """
+    cdef Py_ssize_t npt = xpt.shape[0]
+    cdef Py_ssize_t n = xpt.shape[1]
+    cdef Py_ssize_t i, j, k
+    cdef double temp
+    for j in range(n):
+        hx[j] = 0.0
+    for k in range(npt):
+        temp = 0.0
+        for j in range(n):
+            temp += xpt[k, j] * x[j]
+        temp *= pq[k]
+        for j in range(n):
+            hx[j] += temp * xpt[k, j]
+    if hq is not None:
+        for i in range(n):
+            temp = 0.0
+            for j in range(n):
+                temp += hq[i, j] * x[j]
+            hx[i] += temp
+
+
+cdef double _curv(const double[:] pq, const double[:, :] hq, const double[:] x, const double[:, :] xpt):
+    """
+    Evaluate the curvature of a quadratic function at a vector.
+    """
+    cdef Py_ssize_t npt = xpt.shape[0]
+    cdef Py_ssize_t n = xpt.shape[1]
+    cdef Py_ssize_t i, j, k
+    cdef double cx = 0.0
+    cdef double temp
+    for k in range(npt):
+        temp = 0.0
+        for j in range(n):
+            temp += xpt[k, j] * x[j]
+        cx += pq[k] * temp * temp
+    if hq is not None:
+        for i in range(n):
+            temp = 0.0
+            for j in range(n):
+                temp += hq[i, j] * x[j]
+            cx += x[i] * temp
+    return cx
+
+
+cpdef double quad_eval(const double[:] gq, const double[:] pq, const double[:, :] hq, const double[:] x, const double[:, :] xpt, int kopt):
+    """
+    Evaluate a quadratic function at `x`, relatively to ``xpt[kopt, :]``.
+    """
+    cdef Py_ssize_t n = xpt.shape[1]
+    cdef Py_ssize_t j
+    cdef double[:] step = np_empty(n, dtype=np_float64)
+    cdef double qx = 0.0
+    for j in range(n):
+        step[j] = x[j] - xpt[kopt, j]
+        qx += gq[j] * step[j]
+    return qx + 0.5 * _curv(pq, hq, step, xpt)
+
+
+cpdef quad_grad(const double[:] gq, const double[:] pq, const double[:, :] hq, const double[:] x, const double[:, :] xpt, int kopt, out=None):
+    """
+    Evaluate the gradient of a quadratic function at `x`, relatively to
+    ``xpt[kopt, :]``.
+    """
+    cdef Py_ssize_t n = xpt.shape[1]
+    cdef Py_ssize_t j
+    cdef double[:] step = np_empty(n, dtype=np_float64)
+    if out is None:
+        out = np_empty(n, dtype=np_float64)
+    cdef double[:] gx = out
+    for j in range(n):
+        step[j] = x[j] - xpt[kopt, j]
+    _hessp(pq, hq, step, xpt, gx)
+    for j in range(n):
+        gx[j] += gq[j]
+    return out
+
+
+cpdef quad_hessp(const double[:] pq, const double[:, :] hq, const double[:] x, const double[:, :] xpt, out=None):
+    """
+    Evaluate the product of the Hessian matrix of a quadratic function with
+    `x`.
+    """
+    if out is None:
+        out = np_empty(xpt.shape[1], dtype=np_float64)
+    _hessp(pq, hq, x, xpt, out)
+    return out
+
+
+cpdef double quad_curv(const double[:] pq, const double[:, :] hq, const double[:] x, const double[:, :] xpt):
+    """
+    Evaluate the curvature of a quadratic function at `x`.
+    """
+    return _curv(pq, hq, x, xpt)
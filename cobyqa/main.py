@@ -98,6 +98,15 @@ def minimize(fun, x0, args=(), xl=None, xu=None, Aub=None, bub=None, Aeq=None,
             debug : bool, optional
                 Whether to make debugging tests during the execution, which is
                 not recommended in production (the default is False).
+            workers : {int, callable}, optional
+                Parallelization of the evaluations of the objective and
+                nonlinear constraint functions at the initial interpolation
+                points (the default is 1, meaning that these evaluations are
+                performed serially). If an int larger than one, the evaluations
+                are performed in a pool of threads of this size, and ``-1`` uses
+                a default number of threads. A map-like callable, such as
+                ``multiprocessing.Pool.map``, may also be supplied, in which
+                case the functions and the parameters `args` must be picklable.
 
     Returns
     -------
@@ -162,7 +171,8 @@ def minimize(fun, x0, args=(), xl=None, xu=None, Aub=None, bub=None, Aeq=None,
         small (the default is 0.5).
     store_history : bool, optional
         Whether the history of the different evaluations should be stored (the
-        default is False).
+        default is False). The history is then returned in the attributes
+        ``xhist``, ``fhist``, and ``maxcvhist`` of the result.
 
     References
     ----------
@@ -277,7 +287,12 @@ def minimize(fun, x0, args=(), xl=None, xu=None, Aub=None, bub=None, Aeq=None,
         nfev = 1
     elif struct.target_reached:
         exit_status = 1
-        nfev = struct.kopt + 1
+        if struct.workers != 1 and struct.kopt > 0:
+            # The initial interpolation points other than x0 have all been
+            # evaluated concurrently, even if the target has been reached.
+            nfev = struct.npt
+        else:
+            nfev = struct.kopt + 1
     else:
         exit_status = 0
         nfev = struct.npt
@@ -1,6 +1,7 @@
-import copy
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
+from functools import partial
 
 import numpy as np
 from numpy.testing import assert_, assert_array_less
@@ -12,6 +13,36 @@
 from .utils import RestartRequiredException, huge, implicit_hessian, \
     normalize, absmax_arrays
 
+try:
+    from ._quadratic import quad_curv, quad_eval, quad_grad, quad_hessp
+except ImportError:
+    # The evaluations of the quadratic functions fall back to NumPy if the
+    # compiled kernels are not available, which is slower but still correct.
+    warnings.warn('The compiled extension cobyqa._quadratic is not '
+                  'available; falling back to NumPy.', RuntimeWarning)
+    quad_eval = None
+try:
+    from ._kkt import beta_vlag, givens_sweep
+except ImportError:
+    # Likewise, the Givens rotations of the updates of the inverse KKT matrix
+    # of interpolation fall back to the BLAS functions of SciPy, and the
+    # denominators of the updating formula are evaluated with NumPy.
+    warnings.warn('The compiled extension cobyqa._kkt is not available; '
+                  'falling back to NumPy.', RuntimeWarning)
+    beta_vlag = None
+    givens_sweep = None
+
+# Machine epsilon, smallest positive normal number, and largest finite number
+# in double precision, used to define the tolerances of the method.
+_EPS = np.finfo(float).eps
+_TINY = np.finfo(float).tiny
+_REALMAX = np.finfo(float).max
+
+# Largest number of entries of the interpolation points for which the compiled
+# kernels of the quadratic functions are used. For larger problems, the
+# overhead of the NumPy calls is negligible, and BLAS is faster.
+_QUAD_EXT_MAX_SIZE = 1024
+
 
 class OptimizeResult(dict):
     """
@@ -43,6 +74,16 @@ class OptimizeResult(dict):
         Maximum constraint violation at the solution point provided by the
         optimization solver. It is set only if the problem is not declared
         unconstrained by the optimization solver.
+    xhist : numpy.ndarray, shape (nfev, n)
+        History of the points at which the objective and constraint functions
+        have been evaluated. It is set only if the history is stored.
+    fhist : numpy.ndarray, shape (nfev,)
+        History of the objective function values. It is set only if the
+        history is stored.
+    maxcvhist : numpy.ndarray, shape (nfev,)
+        History of the maximum constraint violations. It is set only if the
+        history is stored and if the problem is not declared unconstrained by
+        the optimization solver.
     """
 
     def __dir__(self):
@@ -224,6 +265,16 @@ def __init__(self, fun, x0, xl=None, xu=None, Aub=None, bub=None, Aeq=None,
                 debug : bool, optional
                     Whether to make debugging tests during the execution, which
                     is not recommended in production (the default is False).
+                workers : {int, callable}, optional
+                    Parallelization of the evaluations of the objective and
+                    nonlinear constraint functions at the initial
+                    interpolation points (the default is 1, meaning that these
+                    evaluations are performed serially). If an int larger than
+                    one, the evaluations are performed in a pool of threads of
+                    this size, and ``-1`` uses a default number of threads. A
+                    map-like callable, such as ``multiprocessing.Pool.map``,
+                    may also be supplied, in which case the functions and the
+                    parameters `args` must be picklable.
         *args : tuple, optional
             Parameters to forward to the objective function, the nonlinear
             inequality constraint function, and the nonlinear equality
@@ -276,7 +327,7 @@ def __init__(self, fun, x0, xl=None, xu=None, Aub=None, bub=None, Aeq=None,
         beq = beq[ieq]
 
         # Remove the variables that are fixed by the bounds.
-        bdtol = 10.0 * np.finfo(float).eps * n
+        bdtol = 10.0 * _EPS * n
         bdtol *= absmax_arrays(xl, xu, initial=1.0)
         self._ifix = np.abs(xl - xu) <= bdtol
         ifree = np.logical_not(self.ifix)
@@ -327,8 +378,9 @@ def __init__(self, fun, x0, xl=None, xu=None, Aub=None, bub=None, Aeq=None,
         self._ceq_hist = []
 
         # Set the initial models of the problem.
+        feval = None if self.workers == 1 else self.evaluate
         self._models = Models(self.fun, self.xbase, xl, xu, Aub, bub, Aeq, beq,
-                              self.cub, self.ceq, self.options, **kwargs)
+                              self.cub, self.ceq, self.options, feval, **kwargs)
         self._target_reached = self._models.target_reached
         if not self.target_reached:
             if self.debug:
@@ -381,50 +433,71 @@ def __call__(self, x, fx, cubx, ceqx, model=False):
             evaluated on the different models is also returned.
         """
         ax = fx
-        if self.penalty > 0.0:
-            cx = np.r_[
-                np.maximum(0.0, np.dot(self.aub, x) - self.bub),
-                np.dot(self.aeq, x) - self.beq,
-                np.maximum(0.0, cubx),
-                ceqx,
-            ]
-            ax += self.penalty * np.linalg.norm(cx)
         if model:
             mx = self.model_obj(x)
-            if self.penalty > 0.0:
-                aub, bub = self.get_linear_ub()
-                aeq, beq = self.get_linear_eq()
-                cx = np.r_[
-                    np.maximum(0.0, np.dot(aub, x) - bub),
-                    np.dot(aeq, x) - beq,
-                ]
-                mx += self.penalty * np.linalg.norm(cx)
+        if self._penalty > 0.0:
+            if model:
+                cx, mcx = self.violation(x, cubx, ceqx, True)
+                mx += self._penalty * mcx
+            else:
+                cx = self.violation(x, cubx, ceqx)
+            ax += self._penalty * cx
+        if model:
             return ax, mx
         return ax
 
-    def __getattr__(self, item):
+    def violation(self, x, cubx, ceqx, model=False):
         """
-        Get options as attributes of the class.
+        Evaluate the l2-norm of the constraint violation.
 
         Parameters
         ----------
-        item : str
-            Name of the option to retrieve.
+        x : numpy.ndarray, shape (n,)
+            Point at which the constraint violation is to be evaluated.
+        cubx : numpy.ndarray, shape (mnlub,)
+            Value of the nonlinear inequality constraint function at `x`.
+        ceqx : numpy.ndarray, shape (mnleq,)
+            Value of the nonlinear equality constraint function at `x`.
+        model : bool, optional
+            Whether to also evaluate the constraint violation on the different
+            models (the default is False).
 
         Returns
         -------
-        object
-            Value of the option.
+        {float, (float, float)}
+            Constraint violation at `x`, evaluated on the nonlinear
+            optimization problem. If ``model = True``, the constraint violation
+            evaluated on the different models is also returned.
 
-        Raises
-        ------
-        AttributeError
-            The required option does not exist.
-        """
-        try:
-            return self.options[item]
-        except KeyError as exc:
-            raise AttributeError(item) from exc
+        Notes
+        -----
+        The merit function is the sum of the objective function and the
+        product of the penalty coefficient with the constraint violation.
+        Hence, the constraint violation can be reused to evaluate the merit
+        function for different penalty coefficients.
+        """
+        # The l2-norm of the constraint violation is accumulated block by
+        # block, which avoids concatenating the residuals. The contribution of
+        # the linear constraints is shared by both constraint violations,
+        # because the linearization of the constraints of the models leaves
+        # them unchanged.
+        models = self._models
+        tub = np.dot(models.aub, x) - models.bub
+        np.maximum(tub, 0.0, out=tub)
+        teq = np.dot(models.aeq, x) - models.beq
+        tnlub = np.maximum(0.0, cubx)
+        clsq = np.inner(tub, tub) + np.inner(teq, teq)
+        cx = np.sqrt(clsq + np.inner(tnlub, tnlub) + np.inner(ceqx, ceqx))
+        if model:
+            xopt = self.xopt
+            step = x - xopt
+            tnlub = self.coptub + np.dot(self.model_cub_jac(xopt), step)
+            np.maximum(tnlub, 0.0, out=tnlub)
+            tnleq = self.copteq + np.dot(self.model_ceq_jac(xopt), step)
+            mcx = clsq + np.inner(tnlub, tnlub) + np.inner(tnleq, tnleq)
+            mcx = np.sqrt(mcx)
+            return cx, mcx
+        return cx
 
     @property
     def xbase(self):
@@ -477,6 +550,171 @@ def options(self):
         """
         return self._options
 
+    @property
+    def rhobeg(self):
+        """
+        Initial trust-region radius.
+
+        The options are exposed as read-only properties, which read the
+        options dictionary, so that the modifications of the options made
+        when checking their consistency are taken into account.
+
+        Returns
+        -------
+        float
+            Initial trust-region radius.
+        """
+        return self._options['rhobeg']
+
+    @property
+    def rhoend(self):
+        """
+        Final trust-region radius.
+
+        Returns
+        -------
+        float
+            Final trust-region radius.
+        """
+        return self._options['rhoend']
+
+    @property
+    def npt(self):
+        """
+        Number of interpolation points.
+
+        Returns
+        -------
+        int
+            Number of interpolation points for the objective and constraint
+            models.
+        """
+        return self._options['npt']
+
+    @property
+    def maxfev(self):
+        """
+        Upper bound on the number of function evaluations.
+
+        Returns
+        -------
+        int
+            Upper bound on the number of objective and constraint function
+            evaluations.
+        """
+        return self._options['maxfev']
+
+    @property
+    def maxiter(self):
+        """
+        Upper bound on the number of main loop iterations.
+
+        Returns
+        -------
+        int
+            Upper bound on the number of main loop iterations.
+        """
+        return self._options['maxiter']
+
+    @property
+    def target(self):
+        """
+        Target value on the objective function.
+
+        Returns
+        -------
+        float
+            Target value on the objective function.
+        """
+        return self._options['target']
+
+    @property
+    def ftol_abs(self):
+        """
+        Absolute tolerance on the objective function.
+
+        Returns
+        -------
+        float
+            Absolute tolerance on the objective function.
+        """
+        return self._options['ftol_abs']
+
+    @property
+    def ftol_rel(self):
+        """
+        Relative tolerance on the objective function.
+
+        Returns
+        -------
+        float
+            Relative tolerance on the objective function.
+        """
+        return self._options['ftol_rel']
+
+    @property
+    def xtol_abs(self):
+        """
+        Absolute tolerance on the decision variables.
+
+        Returns
+        -------
+        float
+            Absolute tolerance on the decision variables.
+        """
+        return self._options['xtol_abs']
+
+    @property
+    def xtol_rel(self):
+        """
+        Relative tolerance on the decision variables.
+
+        Returns
+        -------
+        float
+            Relative tolerance on the decision variables.
+        """
+        return self._options['xtol_rel']
+
+    @property
+    def disp(self):
+        """
+        Whether to print pieces of information on the execution of the solver.
+
+        Returns
+        -------
+        bool
+            Whether to print pieces of information on the execution of the
+            solver.
+        """
+        return self._options['disp']
+
+    @property
+    def debug(self):
+        """
+        Whether to make debugging tests during the execution.
+
+        Returns
+        -------
+        bool
+            Whether to make debugging tests during the execution.
+        """
+        return self._options['debug']
+
+    @property
+    def workers(self):
+        """
+        Parallelization of the initial evaluations.
+
+        Returns
+        -------
+        {int, callable}
+            Number of threads or map-like callable used to evaluate the
+            objective and nonlinear constraint functions at the initial
+            interpolation points.
+        """
+        return self._options['workers']
+
     @property
     def penalty(self):
         """
@@ -954,7 +1192,7 @@ def is_model_step(self):
         """
         return self.knew is not None
 
-    def fun(self, x, **kwargs):
+    def fun(self, x, fx=None, **kwargs):
         """
         Evaluate the objective function of the nonlinear optimization problem.
 
@@ -962,6 +1200,10 @@ def fun(self, x, **kwargs):
         ----------
         x : array_like, shape (n,)
             Point at which the objective function is to be evaluated.
+        fx : float, optional
+            Value of the objective function at `x`, if it has already been
+            evaluated (see `evaluate`). It is then processed as if it had just
+            been returned by the objective function.
 
         Returns
         -------
@@ -976,7 +1218,9 @@ def fun(self, x, **kwargs):
             (the default is False).
         """
         x_full = self.get_x(x)
-        fx = float(self._fun(x_full, *self._args))
+        if fx is None:
+            fx = self._fun(x_full, *self._args)
+        fx = float(fx)
         threshold = huge(x_full.dtype)
         if np.isnan(fx) or fx > threshold:
             fx = threshold
@@ -988,7 +1232,7 @@ def fun(self, x, **kwargs):
             print(f'{self._fun.__name__}({x_full}) = {fx}.')
         return fx
 
-    def cub(self, x, **kwargs):
+    def cub(self, x, cx=None, **kwargs):
         """
         Evaluate the nonlinear inequality constraint function of the nonlinear
         optimization problem.
@@ -997,6 +1241,9 @@ def cub(self, x, **kwargs):
         ----------
         x : array_like, shape (n,)
             Point at which the constraint function is to be evaluated.
+        cx : array_like, shape (mnlub,), optional
+            Value of the constraint function at `x`, if it has already been
+            evaluated (see `evaluate`).
 
         Returns
         -------
@@ -1010,12 +1257,12 @@ def cub(self, x, **kwargs):
             Whether the history of the different evaluations should be stored
             (the default is False).
         """
-        cx = self._eval_con(self._cub, x)
+        cx = self._eval_con(self._cub, x, cx)
         if kwargs.get('store_history') and cx.size > 0:
             self._cub_hist.append(np.copy(cx))
         return cx
 
-    def ceq(self, x, **kwargs):
+    def ceq(self, x, cx=None, **kwargs):
         """
         Evaluate the nonlinear equality constraint function of the nonlinear
         optimization problem.
@@ -1024,6 +1271,9 @@ def ceq(self, x, **kwargs):
         ----------
         x : array_like, shape (n,)
             Point at which the constraint function is to be evaluated.
+        cx : array_like, shape (mnleq,), optional
+            Value of the constraint function at `x`, if it has already been
+            evaluated (see `evaluate`).
 
         Returns
         -------
@@ -1037,11 +1287,42 @@ def ceq(self, x, **kwargs):
             Whether the history of the different evaluations should be stored
             (the default is False).
         """
-        cx = self._eval_con(self._ceq, x)
+        cx = self._eval_con(self._ceq, x, cx)
         if kwargs.get('store_history') and cx.size > 0:
             self._ceq_hist.append(np.copy(cx))
         return cx
 
+    def evaluate(self, xs):
+        """
+        Evaluate the objective and nonlinear constraint functions at several
+        points concurrently.
+
+        The evaluations are distributed according to the option `workers`. The
+        returned values are raw outputs of the user-defined functions, ordered
+        as the points in `xs`, and they must be processed by `fun`, `cub`, and
+        `ceq` before being used (which also records them in the history).
+
+        Parameters
+        ----------
+        xs : numpy.ndarray, shape (k, n)
+            Points at which the functions are to be evaluated. Each row of `xs`
+            stores the coordinates of a point.
+
+        Returns
+        -------
+        list
+            Raw values of the objective function, of the nonlinear inequality
+            constraint function, and of the nonlinear equality constraint
+            function at each point of `xs`, as tuples.
+        """
+        task = partial(_evaluate, self._fun, self._cub, self._ceq, self._args)
+        xs_full = [self.get_x(x) for x in xs]
+        if callable(self.workers):
+            return list(self.workers(task, xs_full))
+        max_workers = None if self.workers == -1 else self.workers
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(task, xs_full))
+
     def active_set(self, x):
         """
         Determine the set of active constraints of the models.
@@ -1057,7 +1338,7 @@ def active_set(self, x):
         numpy.ndarray
             Indices of the active constraints of the models.
         """
-        bdtol = 10.0 * np.finfo(float).eps * self.xopt.size
+        bdtol = 10.0 * _EPS * self.xopt.size
         bdtol *= absmax_arrays(self.xl, self.xu, initial=1.0)
         aub, bub = self.get_linear_ub()
         resid = np.r_[np.dot(aub, x) - bub, self.xl - x, x - self.xu]
@@ -1104,15 +1385,19 @@ def get_linear_ub(self, x=None):
         numpy.ndarray, shape (m,)
             Right-hand side of the linear inequality constraints.
         """
-        aub = np.copy(self.aub)
-        bub = np.copy(self.bub)
+        if self.mnlub == 0:
+            # The linear constraints are returned without any copy, so that
+            # the returned arrays must not be modified in place.
+            return self.aub, self.bub
         if x is None:
             x = self.xopt
-        for i in range(self.mnlub):
-            lhs = self.model_cub_grad(x, i)
-            rhs = np.inner(x, lhs) - self.coptub[i]
-            aub = np.vstack([aub, lhs])
-            bub = np.r_[bub, rhs]
+        mlub = self.mlub
+        aub = np.empty((mlub + self.mnlub, x.size), dtype=float)
+        bub = np.empty(mlub + self.mnlub, dtype=float)
+        aub[:mlub, :] = self.aub
+        bub[:mlub] = self.bub
+        aub[mlub:, :] = self.model_cub_jac(x)
+        bub[mlub:] = np.dot(aub[mlub:, :], x) - self.coptub
         return aub, bub
 
     def get_linear_eq(self, x=None):
@@ -1136,15 +1421,19 @@ def get_linear_eq(self, x=None):
         numpy.ndarray, shape (m,)
             Right-hand side of the linear equality constraints.
         """
-        aeq = np.copy(self.aeq)
-        beq = np.copy(self.beq)
+        if self.mnleq == 0:
+            # The linear constraints are returned without any copy, so that
+            # the returned arrays must not be modified in place.
+            return self.aeq, self.beq
         if x is None:
             x = self.xopt
-        for i in range(self.mnleq):
-            lhs = self.model_ceq_grad(x, i)
-            rhs = np.inner(x, lhs) - self.copteq[i]
-            aeq = np.vstack([aeq, lhs])
-            beq = np.r_[beq, rhs]
+        mleq = self.mleq
+        aeq = np.empty((mleq + self.mnleq, x.size), dtype=float)
+        beq = np.empty(mleq + self.mnleq, dtype=float)
+        aeq[:mleq, :] = self.aeq
+        beq[:mleq] = self.beq
+        aeq[mleq:, :] = self.model_ceq_jac(x)
+        beq[mleq:] = np.dot(aeq[mleq:, :], x) - self.copteq
         return aeq, beq
 
     def model_obj(self, x):
@@ -1409,6 +1698,25 @@ def model_cub_curv(self, x, i):
         """
         return self._models.cub_curv(x, i)
 
+    def model_cub_jac(self, x):
+        """
+        Evaluate the Jacobian matrix of the inequality constraint functions of
+        the model.
+
+        Parameters
+        ----------
+        x : numpy.ndarray, shape (n,)
+            Point at which the Jacobian matrix of the quadratic functions is to
+            be evaluated.
+
+        Returns
+        -------
+        numpy.ndarray, shape (mnlub, n)
+            Jacobian matrix of the inequality constraint functions of the model
+            at `x`. Each row stores the gradient of a constraint function.
+        """
+        return self._models.cub_jac(x)
+
     def model_cub_alt(self, x, i):
         """
         Evaluate an alternative inequality constraint function of the model.
@@ -1607,6 +1915,25 @@ def model_ceq_curv(self, x, i):
         """
         return self._models.ceq_curv(x, i)
 
+    def model_ceq_jac(self, x):
+        """
+        Evaluate the Jacobian matrix of the equality constraint functions of
+        the model.
+
+        Parameters
+        ----------
+        x : numpy.ndarray, shape (n,)
+            Point at which the Jacobian matrix of the quadratic functions is to
+            be evaluated.
+
+        Returns
+        -------
+        numpy.ndarray, shape (mnleq, n)
+            Jacobian matrix of the equality constraint functions of the model at
+            `x`. Each row stores the gradient of a constraint function.
+        """
+        return self._models.ceq_jac(x)
+
     def model_ceq_alt(self, x, i):
         """
         Evaluate an alternative equality constraint function of the model.
@@ -1884,7 +2211,7 @@ def set_default_options(self, n):
         n : int
             Number of decision variables.
         """
-        rhoend = getattr(self, 'rhoend', 1e-6)
+        rhoend = self.options.get('rhoend', 1e-6)
         self.options.setdefault('rhobeg', max(1.0, rhoend))
         self.options.setdefault('rhoend', min(rhoend, self.rhobeg))
         self.options.setdefault('npt', 2 * n + 1)
@@ -1897,6 +2224,7 @@ def set_default_options(self, n):
         self.options.setdefault('xtol_rel', -1.0)
         self.options.setdefault('disp', False)
         self.options.setdefault('debug', False)
+        self.options.setdefault('workers', 1)
 
     def check_options(self, n, stack_level=2):
         """
@@ -1940,6 +2268,18 @@ def check_options(self, n, stack_level=2):
             message = "option 'rhoend' is too large and is decreased."
             warnings.warn(message, RuntimeWarning, stacklevel=stack_level)
 
+        # Ensure that the option 'workers' is either a map-like callable, a
+        # positive number of threads, or -1.
+        workers = self.workers
+        if not callable(workers):
+            if isinstance(workers, (int, np.integer)) and \
+                    (workers >= 1 or workers == -1):
+                self.options['workers'] = int(workers)
+            else:
+                self.options['workers'] = 1
+                message = "option 'workers' is invalid and is set to 1."
+                warnings.warn(message, RuntimeWarning, stacklevel=stack_level)
+
     def get_best_point(self):
         """
         Get the index of the optimal interpolation point.
@@ -1950,16 +2290,52 @@ def get_best_point(self):
             Index of the optimal interpolation point.
         """
         kopt = self.kopt
-        mopt = self(self.xopt, self.fopt, self.coptub, self.copteq)
+        ksav = kopt
+        mval = self.get_merit_values()
+        rval = self.rval
+
+        # The residuals are involved in the comparisons made by less_merit
+        # only if the penalty coefficient is below its tolerance and if the
+        # residuals are not all equal. Otherwise, the best point is the first
+        # minimizer of the merit values, unless xopt is already a minimizer.
+        tol = 10.0 * _EPS * self.npt * np.max(np.abs(mval), initial=1.0)
+        if self.penalty >= tol or np.all(rval == rval[0]):
+            kmin = np.argmin(mval)
+            if mval[kmin] < mval[kopt]:
+                kopt = kmin
+            return kopt
         for k in range(self.npt):
-            if k != self.kopt:
-                mval = self(self.xpt[k, :], self.fval[k], self.cvalub[k, :],
-                            self.cvaleq[k, :])
-                if self.less_merit(mval, self.rval[k], mopt, self.rval[kopt]):
+            if k != ksav:
+                if self.less_merit(mval[k], rval[k], mval[kopt], rval[kopt]):
                     kopt = k
-                    mopt = mval
         return kopt
 
+    def get_merit_values(self):
+        """
+        Evaluate the merit function at every interpolation point.
+
+        The evaluations are performed at once, using the residuals of the
+        linear constraints at the interpolation points maintained by the models.
+
+        Returns
+        -------
+        numpy.ndarray, shape (npt,)
+            Values of the merit function at the interpolation points.
+        """
+        models = self._models
+        mval = np.copy(models.fval)
+        if self._penalty > 0.0:
+            cvaleq = models.cvaleq
+            tub = np.maximum(0.0, models.rlub)
+            teq = models.rleq
+            tnlub = np.maximum(0.0, models.cvalub)
+            cx = np.einsum('ij,ij->i', tub, tub)
+            cx += np.einsum('ij,ij->i', teq, teq)
+            cx += np.einsum('ij,ij->i', tnlub, tnlub)
+            cx += np.einsum('ij,ij->i', cvaleq, cvaleq)
+            mval += self._penalty * np.sqrt(cx)
+        return mval
+
     def prepare_trust_region_step(self):
         """
         Set the next iteration to a trust-region step.
@@ -1980,7 +2356,8 @@ def prepare_model_step(self, delta):
         delta : float
             Trust-region radius.
         """
-        dsq = np.sum((self.xpt - self.xopt[np.newaxis, :]) ** 2.0, axis=1)
+        xdiff = self.xpt - self.xopt[np.newaxis, :]
+        dsq = np.einsum('ij,ij->i', xdiff, xdiff)
         dsq[dsq <= delta ** 2.0] = -np.inf
         if np.any(np.isfinite(dsq)):
             self._knew = np.argmax(dsq)
@@ -2007,8 +2384,7 @@ def less_merit(self, mval1, rval1, mval2, rval2):
         bool
             A flag indicating whether the first point is better than the other.
         """
-        eps = np.finfo(float).eps
-        tol = 10.0 * eps * self.npt * max(1.0, abs(mval2))
+        tol = 10.0 * _EPS * self.npt * max(1.0, abs(mval2))
         if mval1 < mval2:
             return True
         elif self.penalty < tol:
@@ -2033,7 +2409,9 @@ def shift_origin(self, delta):
         delta : float
             Trust-region radius.
         """
-        xoptsq = np.inner(self.xopt, self.xopt)
+        # The square norm of xopt is maintained in the Gram matrix of the
+        # interpolation points.
+        xoptsq = self._models.gram[self.kopt, self.kopt]
 
         # Update the shift from the origin only if the displacement from the
         # shift of the best point is substantial in the trust region.
@@ -2091,7 +2469,7 @@ def update(self, nstep, tstep, delta, **kwargs):
         # Evaluate the objective function, the nonlinear inequality constraint
         # function, and the nonlinear equality constraint function at the trial
         # point. The functions are defined in the space centered at the origin.
-        bdtol = 10.0 * np.finfo(float).eps * self.xopt.size
+        bdtol = 10.0 * _EPS * self.xopt.size
         bdtol *= absmax_arrays(self.xl, self.xu, initial=1.0)
         step = nstep + tstep
         xnew = self.xopt + step
@@ -2103,7 +2481,6 @@ def update(self, nstep, tstep, delta, **kwargs):
 
         # Update the Lagrange multipliers and the penalty parameters for the
         # trust-region ratio to be well-defined.
-        tiny = np.finfo(float).tiny
         is_trust_region_step = not self.is_model_step
         if not self.target_reached:
             ksav = self.kopt
@@ -2117,7 +2494,8 @@ def update(self, nstep, tstep, delta, **kwargs):
                 raise RestartRequiredException
 
             # Determine the trust-region ratio.
-            if is_trust_region_step and abs(mopt - mmx) > tiny * abs(mopt - mx):
+            if is_trust_region_step and \
+                    abs(mopt - mmx) > _TINY * abs(mopt - mx):
                 ratio = (mopt - mx) / (mopt - mmx)
             else:
                 ratio = -1.0
@@ -2147,7 +2525,7 @@ def update(self, nstep, tstep, delta, **kwargs):
                     mx, mmx = self(xsoc, fxs, cubx, ceqx, True)
                     rx = self._models.resid(xsoc, cubx, ceqx)
                     if self.less_merit(mx, rx, mopt, self.maxcv):
-                        if abs(mopt - mmx) > tiny * abs(mopt - mx):
+                        if abs(mopt - mmx) > _TINY * abs(mopt - mx):
                             fx = fxs
                             ratio = (mopt - mx) / (mopt - mmx)
                             mopt = mx
@@ -2162,21 +2540,16 @@ def update_multipliers(self):
         """
         Set the least-squares Lagrange multipliers.
         """
-        n = self.xopt.size
         if self.mlub + self.mleq + self.mnlub + self.mnleq > 0:
             # Determine the matrix of the least-squares problem. The Lagrange
             # multipliers corresponding to nonzero inequality constraint values
             # are zeroed to satisfy the complementary slackness conditions.
-            ilub = np.dot(self.aub, self.xopt) >= self.bub
-            mlub = np.count_nonzero(ilub)
-            inlub = self.coptub >= 0.0
-            mnlub = np.count_nonzero(inlub)
-            cub_jac = np.empty((mnlub, n), dtype=float)
-            for i, j in enumerate(np.flatnonzero(inlub)):
-                cub_jac[i, :] = self.model_cub_grad(self.xopt, j)
-            ceq_jac = np.empty((self.mnleq, n), dtype=float)
-            for i in range(self.mnleq):
-                ceq_jac[i, :] = self.model_ceq_grad(self.xopt, i)
+            ilub = np.flatnonzero(np.dot(self.aub, self.xopt) >= self.bub)
+            mlub = ilub.size
+            inlub = np.flatnonzero(self.coptub >= 0.0)
+            mnlub = inlub.size
+            cub_jac = self.model_cub_jac(self.xopt)[inlub, :]
+            ceq_jac = self.model_ceq_jac(self.xopt)
             A = np.r_[self.aub[ilub, :], cub_jac, self.aeq, ceq_jac].T
 
             # Determine the least-squares Lagrange multipliers that have not
@@ -2236,19 +2609,26 @@ def increase_penalty(self, nstep, tstep, fx, cubx, ceqx, **kwargs):
         penalty_growth_factor : float, optional
             Increasing factor on the penalty coefficient (the default is 2).
         """
-        tiny = np.finfo(float).tiny
+        # The constraint violations at the trial point do not depend on the
+        # penalty coefficient. They are evaluated once, so that the merit
+        # values at the trial point can be updated without evaluating the
+        # models again if the penalty coefficient is increased.
+        xopt = self.xopt
         step = nstep + tstep
-        xnew = self.xopt + step
-        mx, mmx = self(xnew, fx, cubx, ceqx, True)
-        mopt = self(self.xopt, self.fopt, self.coptub, self.copteq)
+        xnew = xopt + step
+        cx, mcx = self.violation(xnew, cubx, ceqx, True)
+        mobj = self.model_obj(xnew)
+        mx = fx + self.penalty * cx
+        mmx = mobj + self.penalty * mcx
+        mopt = self(xopt, self.fopt, self.coptub, self.copteq)
         if self.type not in 'UB' and not self.is_model_step:
-            gopt = self.model_obj_grad(self.xopt)
+            gopt = self.model_obj_grad(xopt)
             hstep = self.model_lag_hessp(step)
             reduct = np.inner(gopt, step) + 0.5 * np.inner(step, hstep)
             aub, bub = self.get_linear_ub()
             aeq, beq = self.get_linear_eq()
-            bub -= np.dot(aub, self.xopt)
-            beq -= np.dot(aeq, self.xopt)
+            bub = bub - np.dot(aub, xopt)
+            beq = beq - np.dot(aeq, xopt)
             resid = np.r_[np.maximum(0.0, -bub), beq]
             violation = np.linalg.norm(resid)
             resid = np.r_[
@@ -2258,11 +2638,12 @@ def increase_penalty(self, nstep, tstep, fx, cubx, ceqx, **kwargs):
             violation -= np.linalg.norm(resid)
             lm = np.r_[self.lmlub, self.lmleq, self.lmnlub, self.lmnleq]
             thold = np.linalg.norm(lm)
-            if violation > tiny * abs(reduct):
+            if violation > _TINY * abs(reduct):
                 thold = max(thold, reduct / violation)
             if self.penalty < kwargs.get('penalty_detection_factor') * thold:
                 self._penalty = kwargs.get('penalty_growth_factor') * thold
-                mx, mmx = self(xnew, fx, cubx, ceqx, True)
+                mx = fx + self.penalty * cx
+                mmx = mobj + self.penalty * mcx
                 self.kopt = self.get_best_point()
                 mopt = self(self.xopt, self.fopt, self.coptub, self.copteq)
         return mx, mmx, mopt
@@ -2283,22 +2664,36 @@ def reduce_penalty(self):
            Advances in Optimization and Numerical Analysis. Ed. by S. Gomez and
            J. P. Hennart. Dordrecht, NL: Springer, 1994, pp. 51--67.
         """
-        tiny = np.finfo(float).tiny
-        fmin = np.min(self.fval)
-        fmax = np.max(self.fval)
-        if self.penalty > 0.0:
-            rlub = np.matmul(self.xpt, self.aub.T) - self.bub[np.newaxis, :]
-            rleq = np.matmul(self.xpt, self.aeq.T) - self.beq[np.newaxis, :]
-            rub = np.c_[rlub, self.cvalub]
-            req = np.c_[rleq, -rleq, self.cvaleq, -self.cvaleq]
-            resid = np.c_[rub, req]
-            cmin = np.min(resid, axis=0)
-            cmax = np.max(resid, axis=0)
+        models = self._models
+        fval = models.fval
+        fmin = np.min(fval)
+        fmax = np.max(fval)
+        if self._penalty > 0.0:
+            # The extreme values of the constraint residuals are computed
+            # block by block. Since the equality constraints are considered
+            # as two opposite inequality constraints, the extreme values of
+            # their opposite are deduced from those of the residuals.
+            cvalub = models.cvalub
+            cvaleq = models.cvaleq
+            rlub = models.rlub
+            rleq = models.rleq
+            rlub_min = np.min(rlub, axis=0)
+            rlub_max = np.max(rlub, axis=0)
+            rleq_min = np.min(rleq, axis=0)
+            rleq_max = np.max(rleq, axis=0)
+            cvalub_min = np.min(cvalub, axis=0)
+            cvalub_max = np.max(cvalub, axis=0)
+            cvaleq_min = np.min(cvaleq, axis=0)
+            cvaleq_max = np.max(cvaleq, axis=0)
+            cmin = np.r_[rlub_min, cvalub_min, rleq_min, -rleq_max,
+                         cvaleq_min, -cvaleq_max]
+            cmax = np.r_[rlub_max, cvalub_max, rleq_max, -rleq_min,
+                         cvaleq_max, -cvaleq_min]
             indices = cmin < 2.0 * cmax
             if np.any(indices):
                 cmin_neg = np.minimum(0.0, cmin[indices])
                 denom = np.min(cmax[indices] - cmin_neg)
-                if denom > tiny * (fmax - fmin):
+                if denom > _TINY * (fmax - fmin):
                     self._penalty = min(self.penalty, (fmax - fmin) / denom)
             else:
                 self._penalty = 0.0
@@ -2358,7 +2753,8 @@ def trust_region_step(self, delta, **kwargs):
             xi = kwargs.get('normal_step_shrinkage_factor')
 
             def normal_obj(x):
-                rub = np.maximum(0.0, np.dot(aub, x) - bub)
+                rub = np.dot(aub, x) - bub
+                np.maximum(rub, 0.0, out=rub)
                 req = np.dot(aeq, x) - beq
                 fx = 0.5 * (np.inner(rub, rub) + np.inner(req, req))
                 gx = np.dot(aub.T, rub) + np.dot(aeq.T, req)
@@ -2370,7 +2766,7 @@ def ball(x):
             if kwargs.get('exact_normal_step'):
                 bounds = Bounds(self.xl, self.xu)
                 constraints = NonlinearConstraint(ball, -np.inf, 0.0)
-                options = {'ftol': max(np.finfo(float).eps, 1e-8 * delta)}
+                options = {'ftol': max(_EPS, 1e-8 * delta)}
                 with warnings.catch_warnings():
                     warnings.simplefilter('ignore')
                     res = scipy_minimize(normal_obj, self.xopt, method='slsqp',
@@ -2383,7 +2779,7 @@ def ball(x):
                              xi * delta, **kwargs)
             ssq = np.inner(nstep, nstep)
             if self.debug:
-                tol = 10.0 * np.finfo(float).eps * self.xopt.size
+                tol = 10.0 * _EPS * self.xopt.size
                 assert_array_less(self.xl - self.xopt - nstep,
                                   tol * absmax_arrays(self.xl, initial=1.0))
                 assert_array_less(self.xopt + nstep - self.xu,
@@ -2406,7 +2802,7 @@ def ball(x):
             tstep = lctcg(xopt, gopt, self.model_lag_hessp, aub, bub, aeq, beq,
                           self.xl, self.xu, delta, **kwargs)
         if self.debug:
-            tol = 10.0 * np.finfo(float).eps * self.xopt.size
+            tol = 10.0 * _EPS * self.xopt.size
             assert_array_less(self.xl - xopt - tstep,
                               tol * absmax_arrays(self.xl, initial=1.0))
             assert_array_less(xopt + tstep - self.xu,
@@ -2465,7 +2861,7 @@ def model_step(self, delta, **kwargs):
         kwargs['debug'] = self.debug
         step = self._models.improve_geometry(self.knew, delta, **kwargs)
         if self.debug:
-            tol = 10.0 * np.finfo(float).eps * self.xopt.size
+            tol = 10.0 * _EPS * self.xopt.size
             assert_array_less(self.xl - self.xopt - step,
                               tol * absmax_arrays(self.xl, initial=1.0))
             assert_array_less(self.xopt + step - self.xu,
@@ -2494,7 +2890,7 @@ def soc_step(self, step, **kwargs):
         ssoc = cpqp(xsav, aub, bub, aeq, beq, self.xl, self.xu, delta, **kwargs)
         ssq = np.inner(ssoc, ssoc)
         if self.debug:
-            tol = 10.0 * np.finfo(float).eps * self.xopt.size
+            tol = 10.0 * _EPS * self.xopt.size
             assert_array_less(self.xl - xsav - ssoc,
                               tol * absmax_arrays(self.xl, initial=1.0))
             assert_array_less(xsav + ssoc - self.xu,
@@ -2536,12 +2932,17 @@ def build_result(self, penalty=0.0, **kwargs):
         """
         if kwargs.get('store_history'):
             # Evaluate the constraint violation at each point in the history.
-            violmx = np.empty_like(self.fun_hist)
-            for i in range(violmx.size):
-                x = self.x_hist[i, :] - self.xbase
-                cubx = self.cub_hist[i, :] if self.cub_hist.size > 0 else []
-                ceqx = self.ceq_hist[i, :] if self.ceq_hist.size > 0 else []
-                violmx[i] = self._models.resid(x, cubx, ceqx)
+            # The violations are evaluated at once for all the points.
+            nhist = self.fun_hist.size
+            x = self.x_hist - self.xbase[np.newaxis, :]
+            cubx = self.cub_hist
+            if cubx.size == 0:
+                cubx = np.empty((nhist, 0))
+            ceqx = self.ceq_hist
+            if ceqx.size == 0:
+                ceqx = np.empty((nhist, 0))
+            violmx = self._models.resid_all(x, cubx, ceqx)
+            maxcv_hist = np.copy(violmx)
 
             # The points considers are those for which the constraint violation
             # is at most twice as large as the least one.
@@ -2568,7 +2969,7 @@ def build_result(self, penalty=0.0, **kwargs):
                     fun_hist = np.copy(self.fun_hist)
                     fun_hist[np.logical_not(iref)] = np.inf
                     imin = np.argmin(fun_hist)
-            xopt = self.x_hist[imin, :]
+            xopt = self.x_hist[imin, :] - self.xbase
             fopt = self.fun_hist[imin]
             maxcv = violmx[imin]
         else:
@@ -2587,6 +2988,13 @@ def build_result(self, penalty=0.0, **kwargs):
             result.jac[free_indices] = self.model_obj_grad(xopt)
         if self.type != 'U':
             result.maxcv = maxcv
+        if kwargs.get('store_history'):
+            result.xhist = np.empty((nhist, self.ifix.size))
+            result.xhist[:, self.ifix] = self.xfix
+            result.xhist[:, np.logical_not(self.ifix)] = self.x_hist
+            result.fhist = self.fun_hist
+            if self.type != 'U':
+                result.maxcvhist = maxcv_hist
         return result
 
     def check_models(self, stack_level=2):
@@ -2609,7 +3017,7 @@ def check_models(self, stack_level=2):
         """
         self._models.check_models(stack_level)
 
-    def _eval_con(self, con, x):
+    def _eval_con(self, con, x, cx=None):
         """
         Evaluate a constraint function.
 
@@ -2624,6 +3032,9 @@ def _eval_con(self, con, x):
             parameters to specify the constraint function.
         x : array_like, shape (n,)
             Point at which the constraint function is to be evaluated.
+        cx : array_like, shape (mnl,), optional
+            Value of the constraint function at `x`, if it has already been
+            evaluated.
 
         Returns
         -------
@@ -2632,7 +3043,9 @@ def _eval_con(self, con, x):
         """
         if con is not None:
             x_full = self.get_x(x)
-            cx = np.atleast_1d(con(x_full, *self._args))
+            if cx is None:
+                cx = con(x_full, *self._args)
+            cx = np.atleast_1d(cx)
             if cx.dtype.kind in np.typecodes['AllInteger']:
                 cx = np.asarray(cx, dtype=float)
             threshold = huge(x_full.dtype)
@@ -2668,7 +3081,7 @@ class Models:
     """
 
     def __init__(self, fun, x0, xl, xu, Aub, bub, Aeq, beq, cub, ceq, options,
-                 **kwargs):
+                 feval=None, **kwargs):
         """
         Construct the initial models of an optimization problem.
 
@@ -2756,6 +3169,17 @@ def __init__(self, fun, x0, xl, xu, Aub, bub, Aeq, beq, cub, ceq, options,
                 debug : bool, optional
                     Whether to make debugging tests during the execution, which
                     is not recommended in production (the default is False).
+        feval : callable, optional
+            Function evaluating concurrently the objective and nonlinear
+            constraint functions at several points.
+
+                ``feval(xs) -> list``
+
+            where ``xs`` is an array with shape (k, n), and where each element
+            of the returned list is a tuple of raw values, to be processed by
+            ``fun(x, fx)``, ``cub(x, cx)``, and ``ceq(x, cx)``. If provided,
+            the initial interpolation points other than `x0` are evaluated at
+            once by `feval`. Otherwise, they are evaluated one at a time.
 
         Other Parameters
         ----------------
@@ -2771,123 +3195,160 @@ def __init__(self, fun, x0, xl, xu, Aub, bub, Aeq, beq, cub, ceq, options,
         self._beq = beq
         normalize(self.aub, self.bub)
         normalize(self.aeq, self.beq)
+        # The Jacobian matrices of the linear constraints are never modified
+        # after their normalization. Their transposes are stored contiguously,
+        # as they are multiplied by the Lagrange multipliers at each evaluation
+        # of the Lagrangian function.
+        self._aub_t = np.ascontiguousarray(self.aub.T)
+        self._aeq_t = np.ascontiguousarray(self.aeq.T)
         self.shift_constraints(x0)
         n = x0.size
         npt = options.get('npt')
         rhobeg = options.get('rhobeg')
         target = options.get('target')
-        cub_x0 = cub(x0)
+        # The nonlinear constraint functions are evaluated at x0 only once,
+        # to determine the number of nonlinear constraints. These evaluations
+        # are then stored as the first rows of cvalub and cvaleq, and must
+        # then be recorded in the history as any other evaluation.
+        cub_x0 = cub(x0, **kwargs)
         mnlub = cub_x0.size
-        ceq_x0 = ceq(x0)
+        ceq_x0 = ceq(x0, **kwargs)
         mnleq = ceq_x0.size
-        self._xpt = np.zeros((npt, n), dtype=float)
-        self._fval = np.empty(npt, dtype=float)
-        self._rval = np.empty(npt, dtype=float)
-        self._cvalub = np.empty((npt, mnlub), dtype=float)
-        self._cvaleq = np.empty((npt, mnleq), dtype=float)
+        # The arrays are zero-initialized, so that the components associated
+        # with points that are not evaluated (if the target is reached during
+        # the initialization) hold deterministic values. The rows are then
+        # filled in ascending order. The interpolation points are however
+        # stored in Fortran order, which is the layout expected by the
+        # subproblem solvers, so that they are not converted at each call.
+        self._xpt = np.zeros((npt, n), dtype=float, order='F')
+        self._vals = np.zeros((npt, 1 + mnlub + mnleq), dtype=float)
+        self._mnlub = mnlub
+        self._rval = np.zeros(npt, dtype=float)
+        self._rlub = np.zeros((npt, self.mlub), dtype=float, order='C')
+        self._rleq = np.zeros((npt, self.mleq), dtype=float, order='C')
         self._bmat = np.zeros((npt + n, n), dtype=float)
         self._zmat = np.zeros((npt, npt - n - 1), dtype=float)
         self._idz = 0
         self._kopt = 0
-        stepa = 0.0
-        stepb = 0.0
-        bdtol = 10.0 * np.finfo(float).eps * n
+        # The dimensions of the problem are fixed, and the scratch arrays below
+        # are reused by every update of the models to avoid reallocating them,
+        # as are the indices of the upper triangular part of an n-by-n matrix.
+        self._diff = np.empty(1 + mnlub + mnleq, dtype=float)
+        self._bsav = np.empty(n, dtype=float)
+        self._xold = np.empty(n, dtype=float)
+        self._iu, self._ju = np.triu_indices(n)
+        bdtol = 10.0 * _EPS * n
         bdtol *= absmax_arrays(xl, xu, initial=1.0)
+
+        # Set the displacements from the origin x0 of the calculations of the
+        # initial interpolation points in the rows of xpt. It is assumed that
+        # there is no conflict between the bounds and x0. Hence, the components
+        # of the initial guess should either equal the bound components or
+        # allow the projection of the initial trust region onto the components
+        # to lie entirely inside the bounds. The points 1, ..., n are along the
+        # coordinate directions, the points n + 1, ..., 2n (if any) are their
+        # opposites, and the remaining points combine two coordinate steps.
+        stepa = np.where(np.abs(self.xu) <= 0.5 * rhobeg, -rhobeg, rhobeg)
+        stepb = np.where(
+            np.abs(self.xl) <= 0.5 * rhobeg,
+            np.minimum(2.0 * rhobeg, self.xu),
+            np.where(np.abs(self.xu) <= 0.5 * rhobeg,
+                     np.maximum(-2.0 * rhobeg, self.xl), -rhobeg))
+        nb = min(n, npt - n - 1)
+        isgl = np.arange(nb, n)
+        idbl = np.arange(nb)
+        kx = np.arange(n, npt - n - 1)
+        shift = kx // n
+        ipt = kx - shift * n
+        jpt = (ipt + shift) % n
+        np.fill_diagonal(self.xpt[1:n + 1, :], stepa)
+        self.xpt[idbl + n + 1, idbl] = stepb[:nb]
+        self.xpt[kx + n + 1, ipt] = stepa[ipt]
+        self.xpt[kx + n + 1, jpt] = stepa[jpt]
+        self._gram = np.dot(self.xpt, self.xpt.T)
+
+        # Set the initial inverse KKT matrix of interpolation. The matrix bmat
+        # holds its last n columns, while zmat stores the rank factorization
+        # matrix of its leading npt submatrix. The entries depend only on the
+        # steps and on rhobeg, and are written directly in their slices.
+        rhosq = rhobeg * rhobeg
+        rhosq_inv = 1.0 / rhosq
+        stepa_inv = 1.0 / stepa[isgl]
+        self.bmat[0, isgl] = -stepa_inv
+        self.bmat[isgl + 1, isgl] = stepa_inv
+        self.bmat[npt + isgl, isgl] = -0.5 * rhosq
+        stepa = stepa[:nb]
+        stepb = stepb[:nb]
+        stepab = stepa * stepb
+        self.bmat[0, idbl] = -(stepa + stepb) / stepab
+        self.bmat[idbl + n + 1, idbl] = -0.5 / stepa
+        self.bmat[idbl + 1, idbl] = -self.bmat[0, idbl]
+        self.bmat[idbl + 1, idbl] -= self.bmat[idbl + n + 1, idbl]
+        self.zmat[0, idbl] = np.sqrt(2.0) / stepab
+        self.zmat[idbl + n + 1, idbl] = np.sqrt(0.5) / rhosq
+        self.zmat[idbl + 1, idbl] = -self.zmat[0, idbl]
+        self.zmat[idbl + 1, idbl] -= self.zmat[idbl + n + 1, idbl]
+        self.zmat[0, kx] = rhosq_inv
+        self.zmat[kx + n + 1, kx] = rhosq_inv
+        self.zmat[ipt + 1, kx] = -rhosq_inv
+        self.zmat[jpt + 1, kx] = -rhosq_inv
+
+        # Evaluate the objective and the nonlinear constraint functions at the
+        # interpolations points and set the residual of each interpolation
+        # point in rval. Stop the computations if a feasible point has reached
+        # the target value.
+        # When the evaluations are performed concurrently, the points other
+        # than x0 are evaluated at once, but the target is still checked at x0
+        # beforehand. The raw values are then processed in order, so that the
+        # history does not depend on the scheduling of the evaluations. They
+        # are all processed even if the target is reached, as they have been
+        # evaluated anyway, and the best point that reaches the target is
+        # selected among them.
+        # The interpolation points are all translated back at once, and the
+        # functions receive the rows of the resulting array. The parts of the
+        # residuals that do not depend on the nonlinear constraint functions
+        # are also evaluated at once at all the interpolation points.
+        xpts = x0[np.newaxis, :] + self.xpt
+        self._rlub[:, :] = np.matmul(self.xpt, self.aub.T) - self.bub
+        self._rleq[:, :] = np.matmul(self.xpt, self.aeq.T) - self.beq
+        rlin = np.max(np.c_[self.rlub, np.abs(self.rleq),
+                            self.xpt - self.xu, self.xl - self.xpt],
+                      axis=1, initial=0.0)
+        fx = cubx = ceqx = None
+        self._target_reached = False
         for k in range(npt):
-            km = k - 1
-            kx = km - n
-
-            # Set the displacements from the origin x0 of the calculations of
-            # the initial interpolation points in the rows of xpt. It is assumed
-            # that there is no conflict between the bounds and x0. Hence, the
-            # components of the initial guess should either equal the bound
-            # components or allow the projection of the initial trust region
-            # onto the components to lie entirely inside the bounds.
-            if 1 <= k <= n:
-                if abs(self.xu[km]) <= 0.5 * rhobeg:
-                    stepa = -rhobeg
-                else:
-                    stepa = rhobeg
-                self.xpt[k, km] = stepa
-            elif n < k <= 2 * n:
-                stepa = self.xpt[kx + 1, kx]
-                if abs(self.xl[kx]) <= 0.5 * rhobeg:
-                    stepb = min(2.0 * rhobeg, self.xu[kx])
-                elif abs(self.xu[kx]) <= 0.5 * rhobeg:
-                    stepb = max(-2.0 * rhobeg, self.xl[kx])
-                else:
-                    stepb = -rhobeg
-                self.xpt[k, kx] = stepb
-            elif k > 2 * n:
-                shift = kx // n
-                ipt = kx - shift * n
-                jpt = (ipt + shift) % n
-                self.xpt[k, ipt] = self.xpt[ipt + 1, ipt]
-                self.xpt[k, jpt] = self.xpt[jpt + 1, jpt]
-
-            # Evaluate the objective and the nonlinear constraint functions at
-            # the interpolations points and set the residual of each
-            # interpolation point in rval. Stop the computations if a feasible
-            # point has reached the target value.
-            self.fval[k] = fun(x0 + self.xpt[k, :], **kwargs)
+            if feval is not None and k > 0:
+                if k == 1:
+                    values = feval(xpts[1:, :])
+                fx, cubx, ceqx = values[k - 1]
+            self.fval[k] = fun(xpts[k, :], fx, **kwargs)
             if k == 0:
                 # The constraints functions have already been evaluated at x0
                 # to initialize the shapes of cvalub and cvaleq.
                 self.cvalub[0, :] = cub_x0
                 self.cvaleq[0, :] = ceq_x0
             else:
-                self.cvalub[k, :] = cub(x0 + self.xpt[k, :], **kwargs)
-                self.cvaleq[k, :] = ceq(x0 + self.xpt[k, :], **kwargs)
-            self.rval[k] = self.resid(k)
+                self.cvalub[k, :] = cub(xpts[k, :], cubx, **kwargs)
+                self.cvaleq[k, :] = ceq(xpts[k, :], ceqx, **kwargs)
+            self.rval[k] = max(rlin[k],
+                               np.max(self.cvalub[k, :], initial=0.0),
+                               np.max(np.abs(self.cvaleq[k, :]), initial=0.0))
             if self.fval[k] <= target and self.rval[k] <= bdtol:
-                self.kopt = k
+                if not self._target_reached or \
+                        self.fval[k] < self.fval[self.kopt]:
+                    self.kopt = k
                 self._target_reached = True
-                break
-
-            # Set the initial inverse KKT matrix of interpolation. The matrix
-            # bmat holds its last n columns, while zmat stored the rank
-            # factorization matrix of its leading not submatrix.
-            if k <= 2 * n:
-                if 1 <= k <= n and npt <= k + n:
-                    self.bmat[0, km] = -1 / stepa
-                    self.bmat[k, km] = 1 / stepa
-                    self.bmat[npt + km, km] = -0.5 * rhobeg ** 2.0
-                elif k > n:
-                    self.bmat[0, kx] = -(stepa + stepb) / (stepa * stepb)
-                    self.bmat[k, kx] = -0.5 / self.xpt[kx + 1, kx]
-                    self.bmat[kx + 1, kx] = -self.bmat[0, kx]
-                    self.bmat[kx + 1, kx] -= self.bmat[k, kx]
-                    self.zmat[0, kx] = np.sqrt(2.0) / (stepa * stepb)
-                    self.zmat[k, kx] = np.sqrt(0.5) / rhobeg ** 2.0
-                    self.zmat[kx + 1, kx] = -self.zmat[0, kx]
-                    self.zmat[kx + 1, kx] -= self.zmat[k, kx]
-            else:
-                shift = kx // n
-                ipt = kx - shift * n
-                jpt = (ipt + shift) % n
-                self.zmat[0, kx] = 1.0 / rhobeg ** 2.0
-                self.zmat[k, kx] = 1.0 / rhobeg ** 2.0
-                self.zmat[ipt + 1, kx] = -1.0 / rhobeg ** 2.0
-                self.zmat[jpt + 1, kx] = -1.0 / rhobeg ** 2.0
-        else:
+                if feval is None or k == 0:
+                    break
+        if not self._target_reached:
             # Set the initial models of the objective and nonlinear constraint
             # functions. The standard models minimize the updates of their
             # Hessian matrices in Frobenius norm when a point of xpt is
             # modified, while the alternative models minimizes their Hessian
             # matrices in Frobenius norm.
-            self._target_reached = False
-            self._obj = self.new_model(self.fval)
-            self._obj_alt = copy.deepcopy(self._obj)
-            self._cub = np.empty(mnlub, dtype=Quadratic)
-            self._cub_alt = np.empty(mnlub, dtype=Quadratic)
-            for i in range(mnlub):
-                self._cub[i] = self.new_model(self.cvalub[:, i])
-                self._cub_alt[i] = copy.deepcopy(self._cub[i])
-            self._ceq = np.empty(mnleq, dtype=Quadratic)
-            self._ceq_alt = np.empty(mnleq, dtype=Quadratic)
-            for i in range(mnleq):
-                self._ceq[i] = self.new_model(self.cvaleq[:, i])
-                self._ceq_alt[i] = copy.deepcopy(self._ceq[i])
+            models = self.new_models(self.vals)
+            self._set_models(models)
+            self._set_models(models, True)
 
         # Determine the type of the problem.
         if self.mlub + self.mleq + self.mnlub + self.mnleq == 0:
@@ -3015,6 +3476,26 @@ def xpt(self):
         """
         return self._xpt
 
+    @property
+    def vals(self):
+        """
+        Evaluations of the objective function and the nonlinear constraint
+        functions of the nonlinear optimization problem at the interpolation
+        points.
+
+        Returns
+        -------
+        numpy.ndarray, shape (npt, 1 + mnlub + mnleq)
+            Evaluations of the objective function and the nonlinear constraint
+            functions of the nonlinear optimization problem at the
+            interpolation points. Each row stores the evaluation of the
+            objective function, followed by the evaluations of the nonlinear
+            inequality and equality constraint functions, at an interpolation
+            point. The arrays `fval`, `cvalub`, and `cvaleq` are views of its
+            columns.
+        """
+        return self._vals
+
     @property
     def fval(self):
         """
@@ -3027,7 +3508,7 @@ def fval(self):
             Evaluations of the objective function of the nonlinear optimization
             problem at the interpolation points.
         """
-        return self._fval
+        return self._vals[:, 0]
 
     @property
     def rval(self):
@@ -3043,6 +3524,53 @@ def rval(self):
         """
         return self._rval
 
+    @property
+    def rlub(self):
+        """
+        Residuals of the linear inequality constraints at the interpolation
+        points.
+
+        The residuals are maintained along with the interpolation points, so
+        that they do not need to be evaluated each time they are required.
+
+        Returns
+        -------
+        numpy.ndarray, shape (npt, mlub)
+            Residuals of the linear inequality constraints at the interpolation
+            points. Each row stores the residuals ``aub @ x - bub`` of the
+            linear inequality constraints at an interpolation point ``x``.
+        """
+        return self._rlub
+
+    @property
+    def rleq(self):
+        """
+        Residuals of the linear equality constraints at the interpolation
+        points.
+
+        Returns
+        -------
+        numpy.ndarray, shape (npt, mleq)
+            Residuals of the linear equality constraints at the interpolation
+            points. Each row stores the residuals ``aeq @ x - beq`` of the
+            linear equality constraints at an interpolation point ``x``.
+        """
+        return self._rleq
+
+    @property
+    def gram(self):
+        """
+        Gram matrix of the interpolation points.
+
+        Returns
+        -------
+        numpy.ndarray, shape (npt, npt)
+            Gram matrix ``xpt @ xpt.T`` of the interpolation points. Its
+            ``kopt``-th column holds the products of the interpolation points
+            with `xopt`.
+        """
+        return self._gram
+
     @property
     def cvalub(self):
         """
@@ -3057,7 +3585,7 @@ def cvalub(self):
             stores the evaluation of the nonlinear inequality constraint
             functions at an interpolation point.
         """
-        return self._cvalub
+        return self._vals[:, 1:1 + self._mnlub]
 
     @property
     def mnlub(self):
@@ -3069,7 +3597,7 @@ def mnlub(self):
         int
             Number of the nonlinear inequality constraints.
         """
-        return self.cvalub.shape[1]
+        return self._mnlub
 
     @property
     def cvaleq(self):
@@ -3085,7 +3613,7 @@ def cvaleq(self):
             stores the evaluation of the nonlinear equality constraint functions
             at an interpolation point.
         """
-        return self._cvaleq
+        return self._vals[:, 1 + self._mnlub:]
 
     @property
     def mnleq(self):
@@ -3097,7 +3625,7 @@ def mnleq(self):
         int
             Number of the nonlinear equality constraints.
         """
-        return self.cvaleq.shape[1]
+        return self._vals.shape[1] - self._mnlub - 1
 
     @property
     def bmat(self):
@@ -3174,17 +3702,22 @@ def kopt(self, knew):
         if self._kopt != knew:
             # Update the Taylor expansion point of the quadratic models. The
             # models may be undefined when this setter is invoked.
-            with suppress(AttributeError):
-                step = self.xpt[knew, :] - self.xopt
-                self._obj.shift_expansion_point(step, self.xpt)
-                self._obj_alt.shift_expansion_point(step, self.xpt)
-                for i in range(self.mnlub):
-                    self._cub[i].shift_expansion_point(step, self.xpt)
-                    self._cub_alt[i].shift_expansion_point(step, self.xpt)
-                for i in range(self.mnleq):
-                    self._ceq[i].shift_expansion_point(step, self.xpt)
-                    self._ceq_alt[i].shift_expansion_point(step, self.xpt)
+            # The shift is skipped only if the two points coincide, in which
+            # case the products of the Hessian matrices of the models with the
+            # step vanish. Otherwise, these products are always added to the
+            # gradients, even for tiny steps, since the Hessian matrices may be
+            # large compared to the gradients.
+            step = self.xpt[knew, :] - self.xopt
+            if np.any(step):
+                with suppress(AttributeError):
+                    # The models hold views of the rows of the stacked
+                    # gradients, which are all shifted at once.
+                    hstep = self._hessp(step)
+                    hstep_alt = self._hessp(step, True)
+                    self._gqs += hstep
+                    self._gqs_alt += hstep_alt
             self._kopt = knew
+            self._jac_cache = None
 
     @property
     def xopt(self):
@@ -3551,6 +4084,25 @@ def cub_curv(self, x, i):
         """
         return self._cub[i].curv(x, self.xpt)
 
+    def cub_jac(self, x):
+        """
+        Evaluate the Jacobian matrix of the inequality constraint functions of
+        the model.
+
+        Parameters
+        ----------
+        x : numpy.ndarray, shape (n,)
+            Point at which the Jacobian matrix of the quadratic functions is to
+            be evaluated.
+
+        Returns
+        -------
+        numpy.ndarray, shape (mnlub, n)
+            Jacobian matrix of the inequality constraint functions of the model
+            at `x`. Each row stores the gradient of a constraint function.
+        """
+        return np.copy(self._jac(x)[1:self.mnlub + 1, :])
+
     def cub_alt(self, x, i):
         """
         Evaluate an alternative inequality constraint function of the model.
@@ -3749,6 +4301,25 @@ def ceq_curv(self, x, i):
         """
         return self._ceq[i].curv(x, self.xpt)
 
+    def ceq_jac(self, x):
+        """
+        Evaluate the Jacobian matrix of the equality constraint functions of
+        the model.
+
+        Parameters
+        ----------
+        x : numpy.ndarray, shape (n,)
+            Point at which the Jacobian matrix of the quadratic functions is to
+            be evaluated.
+
+        Returns
+        -------
+        numpy.ndarray, shape (mnleq, n)
+            Jacobian matrix of the equality constraint functions of the model at
+            `x`. Each row stores the gradient of a constraint function.
+        """
+        return np.copy(self._jac(x)[self.mnlub + 1:, :])
+
     def ceq_alt(self, x, i):
         """
         Evaluate an alternative equality constraint function of the model.
@@ -3875,13 +4446,11 @@ def lag(self, x, lmlub, lmleq, lmnlub, lmnleq):
         float
             Value of the Lagrangian function of the model at `x`.
         """
-        lx = self.obj(x)
-        lx += np.inner(lmlub, np.dot(self.aub, x) - self.bub)
-        lx += np.inner(lmleq, np.dot(self.aeq, x) - self.beq)
-        for i in range(self.mnlub):
-            lx += lmnlub[i] * self.cub(x, i)
-        for i in range(self.mnleq):
-            lx += lmnleq[i] * self.ceq(x, i)
+        lag = self._lag_model(lmnlub, lmnleq)
+        lx = np.inner(np.r_[1.0, lmnlub, lmnleq], self.vals[self.kopt, :])
+        lx += lag(x, self.xpt, self.kopt)
+        glin, clin = self._lag_linear(lmlub, lmleq)
+        lx += np.inner(glin, x) - clin
         return lx
 
     def lag_grad(self, x, lmlub, lmleq, lmnlub, lmnleq):
@@ -3911,13 +4480,9 @@ def lag_grad(self, x, lmlub, lmleq, lmnlub, lmnleq):
         numpy.ndarray, shape (n,)
             Gradient of the Lagrangian function of the model at `x`.
         """
-        gx = self.obj_grad(x)
-        gx += np.dot(self.aub.T, lmlub)
-        gx += np.dot(self.aeq.T, lmleq)
-        for i in range(self.mnlub):
-            gx += lmnlub[i] * self.cub_grad(x, i)
-        for i in range(self.mnleq):
-            gx += lmnleq[i] * self.ceq_grad(x, i)
+        lag = self._lag_model(lmnlub, lmnleq)
+        gx = lag.grad(x, self.xpt, self.kopt)
+        gx += self._lag_linear(lmlub, lmleq)[0]
         return gx
 
     def lag_hess(self, lmnlub, lmnleq):
@@ -3938,12 +4503,8 @@ def lag_hess(self, lmnlub, lmnleq):
         numpy.ndarray, shape (n, n)
             Hessian matrix of the Lagrangian function of the model.
         """
-        hx = self.obj_hess()
-        for i in range(self.mnlub):
-            hx += lmnlub[i] * self.cub_hess(i)
-        for i in range(self.mnleq):
-            hx += lmnleq[i] * self.ceq_hess(i)
-        return hx
+        lag = self._lag_model(lmnlub, lmnleq)
+        return lag.hess(self.xpt)
 
     def lag_hessp(self, x, lmnlub, lmnleq):
         """
@@ -3968,12 +4529,8 @@ def lag_hessp(self, x, lmnlub, lmnleq):
             Value of the product of the Hessian matrix of the Lagrangian
             function of the model with the vector `x`.
         """
-        hx = self.obj_hessp(x)
-        for i in range(self.mnlub):
-            hx += lmnlub[i] * self.cub_hessp(x, i)
-        for i in range(self.mnleq):
-            hx += lmnleq[i] * self.ceq_hessp(x, i)
-        return hx
+        lag = self._lag_model(lmnlub, lmnleq)
+        return lag.hessp(x, self.xpt)
 
     def lag_curv(self, x, lmnlub, lmnleq):
         """
@@ -3996,12 +4553,8 @@ def lag_curv(self, x, lmnlub, lmnleq):
         float
             Curvature of the Lagrangian function of the model at `x`.
         """
-        cx = self.obj_curv(x)
-        for i in range(self.mnlub):
-            cx += lmnlub[i] * self.cub_curv(x, i)
-        for i in range(self.mnleq):
-            cx += lmnleq[i] * self.ceq_curv(x, i)
-        return cx
+        lag = self._lag_model(lmnlub, lmnleq)
+        return lag.curv(x, self.xpt)
 
     def lag_alt(self, x, lmlub, lmleq, lmnlub, lmnleq):
         """
@@ -4029,13 +4582,11 @@ def lag_alt(self, x, lmlub, lmleq, lmnlub, lmnleq):
         float
             Value of the alternative Lagrangian function of the model at `x`.
         """
-        lx = self.obj_alt(x)
-        lx += np.inner(lmlub, np.dot(self.aub, x) - self.bub)
-        lx += np.inner(lmleq, np.dot(self.aeq, x) - self.beq)
-        for i in range(self.mnlub):
-            lx += lmnlub[i] * self.cub_alt(x, i)
-        for i in range(self.mnleq):
-            lx += lmnleq[i] * self.ceq_alt(x, i)
+        lag = self._lag_model(lmnlub, lmnleq, True)
+        lx = np.inner(np.r_[1.0, lmnlub, lmnleq], self.vals[self.kopt, :])
+        lx += lag(x, self.xpt, self.kopt)
+        glin, clin = self._lag_linear(lmlub, lmleq)
+        lx += np.inner(glin, x) - clin
         return lx
 
     def lag_alt_grad(self, x, lmlub, lmleq, lmnlub, lmnleq):
@@ -4066,13 +4617,9 @@ def lag_alt_grad(self, x, lmlub, lmleq, lmnlub, lmnleq):
         numpy.ndarray, shape (n,)
             Gradient of the alternative Lagrangian function of the model at `x`.
         """
-        gx = self.obj_alt_grad(x)
-        gx += np.dot(self.aub.T, lmlub)
-        gx += np.dot(self.aeq.T, lmleq)
-        for i in range(self.mnlub):
-            gx += lmnlub[i] * self.cub_alt_grad(x, i)
-        for i in range(self.mnleq):
-            gx += lmnleq[i] * self.ceq_alt_grad(x, i)
+        lag = self._lag_model(lmnlub, lmnleq, True)
+        gx = lag.grad(x, self.xpt, self.kopt)
+        gx += self._lag_linear(lmlub, lmleq)[0]
         return gx
 
     def lag_alt_hess(self, lmnlub, lmnleq):
@@ -4094,12 +4641,8 @@ def lag_alt_hess(self, lmnlub, lmnleq):
         numpy.ndarray, shape (n, n)
             Hessian matrix of the alternative Lagrangian function of the model.
         """
-        hx = self.obj_alt_hess()
-        for i in range(self.mnlub):
-            hx += lmnlub[i] * self.cub_alt_hess(i)
-        for i in range(self.mnleq):
-            hx += lmnleq[i] * self.ceq_alt_hess(i)
-        return hx
+        lag = self._lag_model(lmnlub, lmnleq, True)
+        return lag.hess(self.xpt)
 
     def lag_alt_hessp(self, x, lmnlub, lmnleq):
         """
@@ -4124,12 +4667,8 @@ def lag_alt_hessp(self, x, lmnlub, lmnleq):
             Value of the product of the Hessian matrix of the alternative
             Lagrangian function of the model with the vector `x`.
         """
-        hx = self.obj_alt_hessp(x)
-        for i in range(self.mnlub):
-            hx += lmnlub[i] * self.cub_alt_hessp(x, i)
-        for i in range(self.mnleq):
-            hx += lmnleq[i] * self.ceq_alt_hessp(x, i)
-        return hx
+        lag = self._lag_model(lmnlub, lmnleq, True)
+        return lag.hessp(x, self.xpt)
 
     def lag_alt_curv(self, x, lmnlub, lmnleq):
         """
@@ -4154,12 +4693,8 @@ def lag_alt_curv(self, x, lmnlub, lmnleq):
             Curvature of the alternative Lagrangian function of the model at
             `x`.
         """
-        cx = self.obj_alt_curv(x)
-        for i in range(self.mnlub):
-            cx += lmnlub[i] * self.cub_alt_curv(x, i)
-        for i in range(self.mnleq):
-            cx += lmnleq[i] * self.ceq_alt_curv(x, i)
-        return cx
+        lag = self._lag_model(lmnlub, lmnleq, True)
+        return lag.curv(x, self.xpt)
 
     def shift_constraints(self, x):
         """
@@ -4186,40 +4721,50 @@ def shift_origin(self):
         """
         xopt = np.copy(self.xopt)
         npt, n = self.xpt.shape
-        xoptsq = np.inner(xopt, xopt)
+        xoptsq = self.gram[self.kopt, self.kopt]
 
-        # Make the changes to bmat that do not depend on zmat.
+        # Make the changes to bmat that do not depend on zmat. The sum of the
+        # rank-two updates associated with the interpolation points is
+        # evaluated with a single matrix product.
         qoptsq = 0.25 * xoptsq
-        updt = np.dot(self.xpt, xopt) - 0.5 * xoptsq
+        updt = self.gram[:, self.kopt] - 0.5 * xoptsq
         hxpt = self.xpt - 0.5 * xopt[np.newaxis, :]
-        for k in range(npt):
-            step = updt[k] * hxpt[k, :] + qoptsq * xopt
-            temp = np.outer(self.bmat[k, :], step)
-            self.bmat[npt:, :] += temp + temp.T
-
-        # Revise bmat to incorporate the changes that depend on zmat.
+        step = updt[:, np.newaxis] * hxpt + qoptsq * xopt[np.newaxis, :]
+        temp = np.matmul(step.T, self.bmat[:npt, :]).T
+        self.bmat[npt:, :] += temp + temp.T
+
+        # Revise bmat to incorporate the changes that depend on zmat. The
+        # first idz columns of zmat contribute negatively, and the others
+        # positively, so that the sums of the rank-one updates are evaluated
+        # with signed matrix products.
         temp = qoptsq * np.outer(xopt, np.sum(self.zmat, axis=0))
         temp += np.matmul(hxpt.T, self.zmat * updt[:, np.newaxis])
-        for k in range(self.idz):
-            self.bmat[:npt, :] -= np.outer(self.zmat[:, k], temp[:, k])
-            self.bmat[npt:, :] -= np.outer(temp[:, k], temp[:, k])
-        for k in range(self.idz, npt - n - 1):
-            self.bmat[:npt, :] += np.outer(self.zmat[:, k], temp[:, k])
-            self.bmat[npt:, :] += np.outer(temp[:, k], temp[:, k])
+        sign = np.ones(npt - n - 1, dtype=float)
+        sign[:self.idz] = -1.0
+        self.bmat[:npt, :] += np.matmul(self.zmat * sign, temp.T)
+        self.bmat[npt:, :] += np.matmul(temp * sign, temp.T)
 
         # Complete the shift by updating the quadratic models, the bound
         # constraints, the right-hand side of the linear inequality and equality
         # constraints, and the interpolation points.
-        self._obj.shift_interpolation_points(self.xpt, self.kopt)
-        self._obj_alt.shift_interpolation_points(self.xpt, self.kopt)
-        for i in range(self.mnlub):
-            self._cub[i].shift_interpolation_points(self.xpt, self.kopt)
-            self._cub_alt[i].shift_interpolation_points(self.xpt, self.kopt)
-        for i in range(self.mnleq):
-            self._ceq[i].shift_interpolation_points(self.xpt, self.kopt)
-            self._ceq_alt[i].shift_interpolation_points(self.xpt, self.kopt)
+        # The products of the implicit parts of the Hessian matrices of the
+        # models with hxpt are evaluated at once for all the models.
+        for alt in (False, True):
+            _, pq, models = self._get_models(alt)
+            hxpq = np.dot(pq, hxpt)
+            for i, model in enumerate(models):
+                model.shift_interpolation_points(self.xpt, self.kopt,
+                                                 hxpq[i, :])
         self.shift_constraints(xopt)
         self._xpt -= xopt[np.newaxis, :]
+        self._gram = np.dot(self.xpt, self.xpt.T)
+        self._jac_cache = None
+
+        # The residuals of the linear constraints are theoretically invariant
+        # under a shift of the origin. They are nonetheless evaluated again, to
+        # prevent the accumulation of computer rounding errors.
+        self._rlub = np.matmul(self.xpt, self.aub.T) - self.bub[np.newaxis, :]
+        self._rleq = np.matmul(self.xpt, self.aeq.T) - self.beq[np.newaxis, :]
 
     def update(self, step, fx, cubx, ceqx, knew=None):
         """
@@ -4267,7 +4812,6 @@ def update(self, step, fx, cubx, ceqx, knew=None):
            CN: Science Press, 2004, pp. 56--78.
         """
         npt, n = self.xpt.shape
-        tiny = np.finfo(float).tiny
 
         # Evaluate the Lagrange polynomials related to the interpolation points
         # and the real parameter beta given in Equation (2.13) of Powell (2004).
@@ -4278,36 +4822,47 @@ def update(self, step, fx, cubx, ceqx, knew=None):
             knew = self._get_point_to_remove(beta, vlag)
 
         # Put zeros in the knew-th row of zmat by applying a sequence of Givens
-        # rotations. The remaining updates are performed below.
-        drotg, = get_blas_funcs(('rotg',), (self.zmat,))
-        drot, = get_blas_funcs(('rot',), (self.zmat,))
-        jdz = 0
-        for j in range(1, npt - n - 1):
-            if j == self.idz:
-                jdz = self.idz
-            elif abs(self.zmat[knew, j]) > 0.0:
-                cval = self.zmat[knew, jdz]
-                sval = self.zmat[knew, j]
-                cosv, sinv = drotg(cval, sval)
-                self.zmat[:, jdz], self.zmat[:, j] = \
-                    drot(self.zmat[:, jdz], self.zmat[:, j], cosv, sinv)
-                self.zmat[knew, j] = 0.0
+        # rotations. The remaining updates are performed below. The rotations
+        # are applied by a compiled kernel if it is available, as each of them
+        # involves only O(npt) operations. The attributes used in the loops
+        # are stored in local variables to avoid repeated lookups.
+        zmat = self.zmat
+        bmat = self.bmat
+        idz = self.idz
+        zknew = zmat[knew, :]
+        vlag_npt = vlag[:npt]
+        if givens_sweep is not None:
+            jdz = givens_sweep(zmat, knew, idz)
+        else:
+            drotg, = get_blas_funcs(('rotg',), (zmat,))
+            drot, = get_blas_funcs(('rot',), (zmat,))
+            jdz = 0
+            for j in range(1, npt - n - 1):
+                if j == idz:
+                    jdz = idz
+                elif abs(zknew[j]) > 0.0:
+                    cosv, sinv = drotg(zknew[jdz], zknew[j])
+                    zmat[:, jdz], zmat[:, j] = \
+                        drot(zmat[:, jdz], zmat[:, j], cosv, sinv)
+                    zknew[j] = 0.0
 
         # Evaluate the denominator in Equation (2.12) of Powell (2004).
-        scala = self.zmat[knew, 0] if self.idz == 0 else -self.zmat[knew, 0]
-        scalb = 0.0 if jdz == 0 else self.zmat[knew, jdz]
-        omega = scala * self.zmat[:, 0] + scalb * self.zmat[:, jdz]
+        scala = zknew[0] if idz == 0 else -zknew[0]
+        scalb = 0.0 if jdz == 0 else zknew[jdz]
+        omega = scala * zmat[:, 0] + scalb * zmat[:, jdz]
         alpha = omega[knew]
         tau = vlag[knew]
-        sigma = alpha * beta + tau ** 2.0
+        sigma = alpha * beta + tau * tau
         vlag[knew] -= 1.0
-        bmax = np.max(np.abs(self.bmat), initial=1.0)
-        zmax = np.max(np.abs(self.zmat), initial=1.0)
-        if abs(sigma) < tiny * max(bmax, zmax):
+        if abs(sigma) < _TINY * _REALMAX and abs(sigma) < _TINY * max(
+                np.max(np.abs(bmat), initial=1.0),
+                np.max(np.abs(zmat), initial=1.0)):
             # The denominator of the updating formula is too small to safely
             # divide the coefficients of the KKT matrix of interpolation.
             # Theoretically, the value of abs(sigma) is always positive, and
-            # becomes small only for ill-conditioned problems.
+            # becomes small only for ill-conditioned problems. The entries of
+            # bmat and zmat are scanned only if abs(sigma) is small enough for
+            # this test to succeed with finite entries.
             raise ZeroDivisionError
 
         # Complete the update of the matrix zmat. The boolean variable reduce
@@ -4318,74 +4873,104 @@ def update(self, step, fx, cubx, ceqx, knew=None):
         hval = np.sqrt(abs(sigma))
         if jdz == 0:
             scala = tau / hval
-            scalb = self.zmat[knew, 0] / hval
-            self.zmat[:, 0] = scala * self.zmat[:, 0] - scalb * vlag[:npt]
+            scalb = zknew[0] / hval
+            zmat[:, 0] = scala * zmat[:, 0] - scalb * vlag_npt
             if sigma < 0.0:
-                if self.idz == 0:
-                    self._idz = 1
+                if idz == 0:
+                    idz = 1
                 else:
                     reduce = True
         else:
             kdz = jdz if beta >= 0.0 else 0
             jdz -= kdz
-            tempa = self.zmat[knew, jdz] * beta / sigma
-            tempb = self.zmat[knew, jdz] * tau / sigma
-            temp = self.zmat[knew, kdz]
-            scala = 1. / np.sqrt(abs(beta) * temp ** 2.0 + tau ** 2.0)
+            tempa = zknew[jdz] * beta / sigma
+            tempb = zknew[jdz] * tau / sigma
+            temp = zknew[kdz]
+            scala = 1. / np.sqrt(abs(beta) * temp * temp + tau * tau)
             scalb = scala * hval
-            self.zmat[:, kdz] = tau * self.zmat[:, kdz] - temp * vlag[:npt]
-            self.zmat[:, kdz] *= scala
-            self.zmat[:, jdz] -= tempa * omega + tempb * vlag[:npt]
-            self.zmat[:, jdz] *= scalb
+            zmat[:, kdz] = tau * zmat[:, kdz] - temp * vlag_npt
+            zmat[:, kdz] *= scala
+            zmat[:, jdz] -= tempa * omega + tempb * vlag_npt
+            zmat[:, jdz] *= scalb
             if sigma <= 0.0:
                 if beta < 0.0:
-                    self._idz += 1
+                    idz += 1
                 else:
                     reduce = True
         if reduce:
-            self._idz -= 1
-            self.zmat[:, [0, self.idz]] = self.zmat[:, [self.idz, 0]]
+            idz -= 1
+            zmat[:, [0, idz]] = zmat[:, [idz, 0]]
+        self._idz = idz
 
         # Update accordingly bmat. The copy below is crucial, as the slicing
-        # would otherwise return a view of the knew-th row of bmat only.
-        bsav = np.copy(self.bmat[knew, :])
-        for j in range(n):
-            cosv = (alpha * vlag[npt + j] - tau * bsav[j]) / sigma
-            sinv = (tau * vlag[npt + j] + beta * bsav[j]) / sigma
-            self.bmat[:npt, j] += cosv * vlag[:npt] - sinv * omega
-            self.bmat[npt:npt + j + 1, j] += cosv * vlag[npt:npt + j + 1]
-            self.bmat[npt:npt + j + 1, j] -= sinv * bsav[:j + 1]
-            self.bmat[npt + j, :j + 1] = self.bmat[npt:npt + j + 1, j]
+        # would otherwise return a view of the knew-th row of bmat only. The
+        # leading npt rows of bmat receive a rank-two update, and so does its
+        # trailing symmetric submatrix, whose upper triangular part is updated
+        # and then copied into its lower triangular part.
+        bsav = self._bsav
+        bsav[:] = bmat[knew, :]
+        cosv = (alpha * vlag[npt:] - tau * bsav) / sigma
+        sinv = (tau * vlag[npt:] + beta * bsav) / sigma
+        bmat[:npt, :] += np.outer(vlag_npt, cosv) - np.outer(omega, sinv)
+        iu = self._iu
+        ju = self._ju
+        bmat_sym = bmat[npt:, :]
+        bmat_sym[iu, ju] += cosv[ju] * vlag[npt + iu]
+        bmat_sym[iu, ju] -= sinv[ju] * bsav[iu]
+        bmat_sym[ju, iu] = bmat_sym[iu, ju]
 
         # Update finally the evaluations of the objective function, the
         # nonlinear inequality constraint function, and the nonlinear equality
         # constraint function, the interpolation points, the residuals of the
-        # interpolation points, and the models of the problem.
+        # interpolation points, and the models of the problem. The differences
+        # between the new values and those of the models are evaluated at once
+        # for all the models, before the values at xopt may be overwritten.
         xnew = self.xopt + step
-        xold = np.copy(self.xpt[knew, :])
-        dfx = fx - self.obj(xnew)
-        self.fval[knew] = fx
-        dcubx = np.empty(self.mnlub, dtype=float)
-        for i in range(self.mnlub):
-            dcubx[i] = cubx[i] - self.cub(xnew, i)
-        self.cvalub[knew, :] = cubx
-        dceqx = np.empty(self.mnleq, dtype=float)
-        for i in range(self.mnleq):
-            dceqx[i] = ceqx[i] - self.ceq(xnew, i)
-        self.cvaleq[knew, :] = ceqx
+        xold = self._xold
+        xold[:] = self.xpt[knew, :]
+        diff = self._diff
+        diff[0] = fx
+        diff[1:self.mnlub + 1] = cubx
+        diff[self.mnlub + 1:] = ceqx
+        diff -= self.vals[self.kopt, :]
+        self.vals[knew, 0] = fx
+        self.vals[knew, 1:self.mnlub + 1] = cubx
+        self.vals[knew, self.mnlub + 1:] = ceqx
+        diff -= self._val(xnew)
+        dfx = diff[0]
+        dcubx = diff[1:self.mnlub + 1]
+        dceqx = diff[self.mnlub + 1:]
         self.xpt[knew, :] = xnew
+        self.gram[knew, :] = np.dot(self.xpt, xnew)
+        self.gram[:, knew] = self.gram[knew, :]
+        self.rlub[knew, :] = np.dot(self.aub, xnew) - self.bub
+        self.rleq[knew, :] = np.dot(self.aeq, xnew) - self.beq
         self.rval[knew] = self.resid(knew)
+        # The implicit Hessian matrix and the gradient of the knew-th Lagrange
+        # polynomial do not depend on the model, and are computed only once.
+        omega, glag = Quadratic.lagrange_terms(
+            self.xpt, self.kopt, self.bmat, self.zmat, self.idz, knew,
+            self.gram[:, self.kopt])
         self._obj.update(self.xpt, self.kopt, xold, self.bmat, self.zmat,
-                         self.idz, knew, dfx)
-        self._obj_alt = self.new_model(self.fval)
+                         self.idz, knew, dfx, omega, glag)
         for i in range(self.mnlub):
             self._cub[i].update(self.xpt, self.kopt, xold, self.bmat, self.zmat,
-                                self.idz, knew, dcubx[i])
-            self._cub_alt[i] = self.new_model(self.cvalub[:, i])
+                                self.idz, knew, dcubx[i], omega, glag)
         for i in range(self.mnleq):
             self._ceq[i].update(self.xpt, self.kopt, xold, self.bmat, self.zmat,
-                                self.idz, knew, dceqx[i])
-            self._ceq_alt[i] = self.new_model(self.cvaleq[:, i])
+                                self.idz, knew, dceqx[i], omega, glag)
+
+        # The alternative models are obtained by interpolating the new values
+        # at once. Unless a shift of the origin gave them explicit Hessian
+        # matrices, their coefficients are written in place in the arrays
+        # whose rows they view, so that no model needs to be rebuilt.
+        if all(model.hq_is_zero for model in self._models_alt):
+            gq, pq = self._interpolate(self.vals)
+            self._gqs_alt[:, :] = gq.T
+            self._pqs_alt[:, :] = pq.T
+            self._jac_cache = None
+        else:
+            self._set_models(self.new_models(self.vals), True)
         return knew
 
     def new_model(self, val):
@@ -4415,6 +5000,33 @@ def new_model(self, val):
         model.shift_expansion_point(self.xopt, self.xpt)
         return model
 
+    def new_models(self, vals):
+        """
+        Generate several models obtained by underdetermined interpolation.
+
+        The models are the same as those generated by `new_model`, but the
+        products with the matrices of the inverse KKT matrix of interpolation
+        are made for all the models at once.
+
+        Parameters
+        ----------
+        vals : numpy.ndarray, shape (npt, m)
+            Evaluations associated with the interpolation points. Each column of
+            `vals` defines the interpolation conditions of a model.
+
+        Returns
+        -------
+        numpy.ndarray, shape (m,)
+            The quadratic models that satisfy the interpolation conditions
+            defined by the columns of `vals`, whose Hessian matrices are least
+            in Frobenius norm.
+        """
+        gq, pq = self._interpolate(vals)
+        models = np.empty(vals.shape[1], dtype=Quadratic)
+        for i in range(vals.shape[1]):
+            models[i] = Quadratic.from_arrays(gq[:, i], pq[:, i])
+        return models
+
     def reset_models(self):
         """
         Reset the models.
@@ -4423,9 +5035,7 @@ def reset_models(self):
         constraint function, and the nonlinear equality constraint function are
         set to the ones whose Hessian matrices are least in Frobenius norm.
         """
-        self._obj = copy.deepcopy(self._obj_alt)
-        self._cub = copy.deepcopy(self._cub_alt)
-        self._ceq = copy.deepcopy(self._ceq_alt)
+        self._set_models(self._models_alt)
 
     def improve_geometry(self, klag, delta, **kwargs):
         """
@@ -4472,18 +5082,18 @@ def improve_geometry(self, klag, delta, **kwargs):
         """
         # Define the tolerances to compare floating-point numbers with zero.
         npt = self.xpt.shape[0]
-        eps = np.finfo(float).eps
-        tol = 10.0 * eps * npt
+        tol = 10.0 * _EPS * npt
 
         # Determine the klag-th Lagrange polynomial. It is the quadratic
         # function whose value is zero at each interpolation point, except at
         # the klag-th one, whose value is one. The freedom bequeathed by these
         # interpolation conditions is taken up by minimizing the Hessian matrix
-        # of the quadratic function is Frobenius norm.
+        # of the quadratic function is Frobenius norm. The implicit part of its
+        # Hessian matrix is the klag-th column of the leading npt submatrix of
+        # the inverse KKT matrix of interpolation, which provides alpha.
         lag = self.new_model(klag)
         glag = lag.grad(self.xopt, self.xpt, self.kopt)
-        omega = implicit_hessian(self.zmat, self.idz, klag)
-        alpha = omega[klag]
+        alpha = lag.pq[klag]
 
         if not kwargs['model_step_tcg']:
             # Determine a point on a line between xopt and another interpolation
@@ -4493,7 +5103,7 @@ def improve_geometry(self, klag, delta, **kwargs):
             step = bvlag(self.xpt, self.kopt, klag, glag, self.xl, self.xu,
                          delta, alpha, **kwargs)
             beta, vlag = self._beta(step)
-            sigma = vlag[klag] ** 2.0 + alpha * beta
+            sigma = vlag[klag] * vlag[klag] + alpha * beta
 
             # Evaluate the constrained Cauchy step from the optimal point of the
             # absolute value of the klag-th Lagrange polynomial.
@@ -4507,11 +5117,11 @@ def improve_geometry(self, klag, delta, **kwargs):
             step = bvtcg(self.xopt, glag, lag.hessp, self.xl, self.xu, delta,
                          self.xpt, **kwargs)
             beta, vlag = self._beta(step)
-            sigma = vlag[klag] ** 2.0 + alpha * beta
+            sigma = vlag[klag] * vlag[klag] + alpha * beta
             salt = bvtcg(self.xopt, -glag, lambda x: -lag.hessp(x, self.xpt),
                          self.xl, self.xu, delta, **kwargs)
             beta, vlag = self._beta(salt)
-            sigalt = vlag[klag] ** 2.0 + alpha * beta
+            sigalt = vlag[klag] * vlag[klag] + alpha * beta
             if abs(sigma) < abs(sigalt):
                 step = salt
         return step
@@ -4542,13 +5152,48 @@ def resid(self, x, cubx=None, ceqx=None):
             optimization problem at `x`.
         """
         if isinstance(x, (int, np.integer)):
+            rub = self.rlub[x, :]
+            req = self.rleq[x, :]
             cubx = self.cvalub[x, :]
             ceqx = self.cvaleq[x, :]
             x = self.xpt[x, :]
-        cub = np.r_[np.dot(self.aub, x) - self.bub, cubx]
-        ceq = np.r_[np.dot(self.aeq, x) - self.beq, ceqx]
-        cbd = np.r_[x - self.xu, self.xl - x]
-        return np.max(np.r_[cub, np.abs(ceq), cbd], initial=0.0)
+        else:
+            rub = np.dot(self.aub, x) - self.bub
+            req = np.dot(self.aeq, x) - self.beq
+        # The maximum violation is reduced from each kind of constraints
+        # separately, to avoid concatenating the residuals.
+        return max(np.max(rub, initial=0.0), np.max(cubx, initial=0.0),
+                   np.max(np.abs(req), initial=0.0),
+                   np.max(np.abs(ceqx), initial=0.0),
+                   np.max(x - self.xu, initial=0.0),
+                   np.max(self.xl - x, initial=0.0))
+
+    def resid_all(self, x, cubx, ceqx):
+        """
+        Evaluate the residuals associated with the constraints of the nonlinear
+        optimization problem at several points at once.
+
+        Parameters
+        ----------
+        x : numpy.ndarray, shape (m, n)
+            Points at which the residuals are to be evaluated, stored in rows.
+        cubx : numpy.ndarray, shape (m, mnlub)
+            Values of the nonlinear inequality constraint function at the rows
+            of `x`.
+        ceqx : numpy.ndarray, shape (m, mnleq)
+            Values of the nonlinear equality constraint function at the rows of
+            `x`.
+
+        Returns
+        -------
+        numpy.ndarray, shape (m,)
+            Residuals associated with the constraints of the nonlinear
+            optimization problem at the rows of `x`.
+        """
+        rub = np.matmul(x, self.aub.T) - self.bub[np.newaxis, :]
+        req = np.matmul(x, self.aeq.T) - self.beq[np.newaxis, :]
+        return np.max(np.c_[rub, cubx, np.abs(req), np.abs(ceqx),
+                            x - self.xu, self.xl - x], axis=1, initial=0.0)
 
     def check_models(self, stack_level=2):
         """
@@ -4569,13 +5214,286 @@ def check_models(self, stack_level=2):
             interpolation conditions up to a certain tolerance.
         """
         stack_level += 1
-        self._obj.check_model(self.xpt, self.fval, self.kopt, stack_level)
-        for i in range(self.mnlub):
-            self._cub[i].check_model(
-                self.xpt, self.cvalub[:, i], self.kopt, stack_level)
-        for i in range(self.mnleq):
-            self._ceq[i].check_model(
-                self.xpt, self.cvaleq[:, i], self.kopt, stack_level)
+        for i, model in enumerate(self._models):
+            model.check_model(self.xpt, self.vals[:, i], self.kopt,
+                              stack_level)
+
+    def _set_models(self, models, alt=False):
+        """
+        Set the standard or alternative models of the problem.
+
+        Parameters
+        ----------
+        models : numpy.ndarray, shape (1 + mnlub + mnleq,)
+            Models of the objective function, of the nonlinear inequality
+            constraint functions, and of the nonlinear equality constraint
+            functions, in this order.
+        alt : bool, optional
+            Whether the alternative models are to be set (the default is
+            False).
+
+        Notes
+        -----
+        The gradients and the implicit parts of the Hessian matrices of the
+        models are stored row-wise in two matrices, and the models hold views
+        of their rows. Therefore, the models can be evaluated at once without
+        gathering their components, and their in-place updates are reflected in
+        these matrices. The models are copied, so that they do not share memory
+        with `models`.
+        """
+        gq = np.array([model.gq for model in models], dtype=float)
+        pq = np.array([model.pq for model in models], dtype=float)
+        copies = np.empty(models.size, dtype=Quadratic)
+        for i, model in enumerate(models):
+            hq = None if model.hq_is_zero else np.copy(model.hq)
+            copies[i] = Quadratic.from_arrays(gq[i, :], pq[i, :], hq, False)
+        mnlub = self.mnlub
+        if alt:
+            self._gqs_alt = gq
+            self._pqs_alt = pq
+            self._models_alt = copies
+            self._obj_alt = copies[0]
+            self._cub_alt = copies[1:mnlub + 1]
+            self._ceq_alt = copies[mnlub + 1:]
+        else:
+            self._gqs = gq
+            self._pqs = pq
+            self._models = copies
+            self._obj = copies[0]
+            self._cub = copies[1:mnlub + 1]
+            self._ceq = copies[mnlub + 1:]
+        self._jac_cache = None
+
+    def _get_models(self, alt=False):
+        """
+        Get the standard or alternative models of the problem.
+
+        Parameters
+        ----------
+        alt : bool, optional
+            Whether the alternative models are to be returned (the default is
+            False).
+
+        Returns
+        -------
+        numpy.ndarray, shape (1 + mnlub + mnleq, n)
+            Gradients of the models, stored row-wise.
+        numpy.ndarray, shape (1 + mnlub + mnleq, npt)
+            Implicit parts of the Hessian matrices of the models, stored
+            row-wise.
+        numpy.ndarray, shape (1 + mnlub + mnleq,)
+            Models of the objective function, of the nonlinear inequality
+            constraint functions, and of the nonlinear equality constraint
+            functions, in this order.
+        """
+        if alt:
+            return self._gqs_alt, self._pqs_alt, self._models_alt
+        return self._gqs, self._pqs, self._models
+
+    def _lag_model(self, lmnlub, lmnleq, alt=False):
+        """
+        Build the quadratic part of a Lagrangian function of the model.
+
+        Parameters
+        ----------
+        lmnlub : numpy.ndarray, shape (mnlub,)
+            Lagrange multipliers associated with the quadratic models of the
+            nonlinear inequality constraints.
+        lmnleq : numpy.ndarray, shape (mnleq,)
+            Lagrange multipliers associated with the quadratic models of the
+            nonlinear equality constraints.
+        alt : bool, optional
+            Whether the alternative models are to be combined (the default is
+            False).
+
+        Returns
+        -------
+        Quadratic
+            Combination of the models of the objective and nonlinear constraint
+            functions weighted by the Lagrange multipliers. Its second-order
+            terms are those of the Lagrangian function of the model. The
+            constant terms of the models are not included.
+
+        Notes
+        -----
+        Only the models whose Lagrange multipliers are not negligible are
+        combined. If all the multipliers are negligible, or if the problem has
+        no nonlinear constraints, the model of the objective function is
+        returned.
+        """
+        gq, pq, models = self._get_models(alt)
+        if models.size == 1:
+            return models[0]
+        weights = np.r_[1.0, lmnlub, lmnleq]
+        active = np.flatnonzero(np.abs(weights) > _TINY)
+        if active.size == 1:
+            return models[0]
+        weights = weights[active]
+        gq = gq[active, :]
+        pq = pq[active, :]
+        hq = None
+        for weight, model in zip(weights, models[active]):
+            if not model.hq_is_zero:
+                if hq is None:
+                    hq = weight * model.hq
+                else:
+                    hq += weight * model.hq
+        return Quadratic.from_arrays(np.dot(weights, gq), np.dot(weights, pq),
+                                     hq, False)
+
+    def _lag_linear(self, lmlub, lmleq):
+        """
+        Build the linear part of a Lagrangian function of the model.
+
+        Parameters
+        ----------
+        lmlub : numpy.ndarray, shape (mlub,)
+            Lagrange multipliers associated with the linear inequality
+            constraints.
+        lmleq : numpy.ndarray, shape (mleq,)
+            Lagrange multipliers associated with the linear equality
+            constraints.
+
+        Returns
+        -------
+        numpy.ndarray, shape (n,)
+            Gradient of the terms of the Lagrangian function associated with
+            the linear constraints.
+        float
+            Opposite of the constant term of the terms of the Lagrangian
+            function associated with the linear constraints.
+        """
+        glin = np.dot(self._aub_t, lmlub) + np.dot(self._aeq_t, lmleq)
+        clin = np.inner(lmlub, self.bub) + np.inner(lmleq, self.beq)
+        return glin, clin
+
+    def _interpolate(self, vals):
+        """
+        Evaluate the coefficients of several models obtained by
+        underdetermined interpolation.
+
+        Parameters
+        ----------
+        vals : numpy.ndarray, shape (npt, m)
+            Evaluations associated with the interpolation points. Each column of
+            `vals` defines the interpolation conditions of a model.
+
+        Returns
+        -------
+        numpy.ndarray, shape (n, m)
+            Gradients at `xopt` of the models, stored in columns.
+        numpy.ndarray, shape (npt, m)
+            Parameters of the implicit Hessian matrices of the models, stored
+            in columns. The Hessian matrices have no explicit parts.
+        """
+        npt = self.xpt.shape[0]
+        gq = np.dot(self.bmat[:npt, :].T, vals)
+        pq = implicit_hessian(self.zmat, self.idz, vals)
+
+        # The models are defined around the origin, and their expansion points
+        # are then shifted to xopt. Their Hessian matrices have no explicit
+        # parts, so that the shifts are given by their implicit parts only.
+        xxopt = self.gram[:, self.kopt]
+        gq += np.dot(self.xpt.T, pq * xxopt[:, np.newaxis])
+        return gq, pq
+
+    def _val(self, x, alt=False):
+        """
+        Evaluate all the models at once.
+
+        Parameters
+        ----------
+        x : numpy.ndarray, shape (n,)
+            Point at which the models are to be evaluated.
+        alt : bool, optional
+            Whether the alternative models are to be evaluated (the default is
+            False).
+
+        Returns
+        -------
+        numpy.ndarray, shape (1 + mnlub + mnleq,)
+            Values of the models of the objective function, of the nonlinear
+            inequality constraint functions, and of the nonlinear equality
+            constraint functions at `x`, without their constant terms.
+        """
+        # The product of the interpolation points with the displacement from
+        # xopt is shared by all the models, so that their first- and
+        # second-order terms are obtained with matrix-vector products.
+        gq, pq, models = self._get_models(alt)
+        step = x - self.xopt
+        val = np.dot(gq, step)
+        temp = np.dot(self.xpt, step)
+        temp *= temp
+        val += 0.5 * np.dot(pq, temp)
+        for i, model in enumerate(models):
+            if not model.hq_is_zero:
+                val[i] += 0.5 * np.dot(step, np.dot(model.hq, step))
+        return val
+
+    def _jac(self, x, alt=False):
+        """
+        Evaluate the gradients of all the models at once.
+
+        Parameters
+        ----------
+        x : numpy.ndarray, shape (n,)
+            Point at which the gradients of the models are to be evaluated.
+        alt : bool, optional
+            Whether the alternative models are to be considered (the default
+            is False).
+
+        Returns
+        -------
+        numpy.ndarray, shape (1 + mnlub + mnleq, n)
+            Gradients of the models of the objective function, of the
+            nonlinear inequality constraint functions, and of the nonlinear
+            equality constraint functions at `x`. It must not be modified, as
+            it may be returned again by subsequent calls.
+
+        Notes
+        -----
+        The Jacobian matrices of the inequality and equality constraints are
+        often required successively at the same point. Therefore, the last
+        gradients are stored, until the models or `xopt` are modified.
+        """
+        if self._jac_cache is not None:
+            x_cache, alt_cache, jac = self._jac_cache
+            if alt == alt_cache and np.array_equal(x, x_cache):
+                return jac
+        jac = self._hessp(x - self.xopt, alt)
+        jac += self._get_models(alt)[0]
+        self._jac_cache = (np.copy(x), alt, jac)
+        return jac
+
+    def _hessp(self, x, alt=False):
+        """
+        Evaluate the products of the Hessian matrices of all the models with a
+        vector at once.
+
+        Parameters
+        ----------
+        x : numpy.ndarray, shape (n,)
+            Vector to be left-multiplied by the Hessian matrices of the models.
+        alt : bool, optional
+            Whether the alternative models are to be considered (the default
+            is False).
+
+        Returns
+        -------
+        numpy.ndarray, shape (1 + mnlub + mnleq, n)
+            Products of the Hessian matrices of the models of the objective
+            function, of the nonlinear inequality constraint functions, and of
+            the nonlinear equality constraint functions with `x`.
+        """
+        # The product of the interpolation points with x is shared by the
+        # implicit parts of all the Hessian matrices, so that the products are
+        # obtained with a single matrix-matrix product.
+        _, pq, models = self._get_models(alt)
+        hx = np.dot(pq * np.dot(self.xpt, x), self.xpt)
+        for i, model in enumerate(models):
+            if not model.hq_is_zero:
+                hx[i, :] += np.dot(model.hq, x)
+        return hx
 
     def _get_point_to_remove(self, beta, vlag):
         """
@@ -4606,13 +5524,24 @@ def _get_point_to_remove(self, beta, vlag):
            Numerical Linear Algebra and Optimization. Ed. by Y. Yuan. Beijing,
            CN: Science Press, 2004, pp. 56--78.
         """
+        # The row sums of squares are evaluated by contractions, to avoid
+        # building the squared arrays. The temporary arrays are then updated
+        # in place.
         npt = self.xpt.shape[0]
-        zsq = self.zmat ** 2.0
-        zsq = np.c_[-zsq[:, :self.idz], zsq[:, self.idz:]]
-        alpha = np.sum(zsq, axis=1)
-        sigma = vlag[:npt] ** 2.0 + beta * alpha
-        dsq = np.sum((self.xpt - self.xopt[np.newaxis, :]) ** 2.0, axis=1)
-        return np.argmax(np.abs(sigma) * np.square(dsq))
+        zpos = self.zmat[:, self.idz:]
+        alpha = np.einsum('ij,ij->i', zpos, zpos)
+        if self.idz > 0:
+            zneg = self.zmat[:, :self.idz]
+            alpha -= np.einsum('ij,ij->i', zneg, zneg)
+        sigma = vlag[:npt] * vlag[:npt]
+        alpha *= beta
+        sigma += alpha
+        np.abs(sigma, out=sigma)
+        step = self.xpt - self.xopt[np.newaxis, :]
+        dsq = np.einsum('ij,ij->i', step, step)
+        dsq *= dsq
+        sigma *= dsq
+        return np.argmax(sigma)
 
     def _beta(self, step):
         """
@@ -4637,24 +5566,41 @@ def _beta(self, step):
         """
         npt, n = self.xpt.shape
         vlag = np.empty(npt + n, dtype=float)
+        if beta_vlag is not None and self.xpt.size <= _QUAD_EXT_MAX_SIZE:
+            # The compiled kernel evaluates beta and vlag in a single pass, and
+            # avoids the overhead of the many small NumPy calls below.
+            beta = beta_vlag(self.xpt, self.bmat, self.zmat,
+                             self.gram[:, self.kopt], step,
+                             self.gram[self.kopt, self.kopt], self.idz,
+                             self.kopt, vlag)
+            return beta, vlag
         stepsq = np.inner(step, step)
-        xoptsq = np.inner(self.xopt, self.xopt)
+        xoptsq = self.gram[self.kopt, self.kopt]
         stx = np.inner(step, self.xopt)
         xstep = np.dot(self.xpt, step)
-        xxopt = np.dot(self.xpt, self.xopt)
-        check = xstep * (0.5 * xstep + xxopt)
-        zalt = np.c_[-self.zmat[:, :self.idz], self.zmat[:, self.idz:]]
-        temp = np.dot(zalt.T, check)
+        xxopt = self.gram[:, self.kopt]
+        check = 0.5 * xstep
+        check += xxopt
+        check *= xstep
+        # The signs of the leading idz columns of zmat are applied to the
+        # product with check rather than to a copy of zmat.
+        temp = np.dot(self.zmat.T, check)
         beta = np.inner(temp[:self.idz], temp[:self.idz])
         beta -= np.inner(temp[self.idz:], temp[self.idz:])
-        vlag[:npt] = np.dot(self.bmat[:npt, :], step)
+        temp[:self.idz] = -temp[:self.idz]
+
+        # The leading npt rows of bmat and its trailing symmetric submatrix are
+        # contiguous views, and the products are written directly in vlag.
+        bmat_npt = self.bmat[:npt, :]
+        bmat_sym = self.bmat[npt:, :]
+        np.dot(bmat_npt, step, out=vlag[:npt])
         vlag[:npt] += np.dot(self.zmat, temp)
         vlag[self.kopt] += 1.0
-        vlag[npt:] = np.dot(self.bmat[:npt, :].T, check)
+        np.dot(check, bmat_npt, out=vlag[npt:])
         bsp = np.inner(vlag[npt:], step)
-        vlag[npt:] += np.dot(self.bmat[npt:, :], step)
+        vlag[npt:] += np.dot(bmat_sym, step)
         bsp += np.inner(vlag[npt:], step)
-        beta += stx ** 2.0 + stepsq * (xoptsq + 2.0 * stx + 0.5 * stepsq) - bsp
+        beta += stx * stx + stepsq * (xoptsq + 2.0 * stx + 0.5 * stepsq) - bsp
         return beta, vlag
 
 
@@ -4738,15 +5684,21 @@ def __call__(self, x, xpt, kopt):
         float
             Value of the quadratic function at `x`.
         """
+        if _use_quad_ext(xpt):
+            return quad_eval(self._gq, self._pq, self._hq, x, xpt, kopt)
         x = x - xpt[kopt, :]
-        qx = np.inner(self.gq, x)
-        qx += 0.5 * np.inner(self.pq, np.dot(xpt, x) ** 2.0)
+        qx = np.dot(self._gq, x)
+        # The temporary vector xpt @ x is squared in place, to avoid allocating
+        # another vector of size npt.
+        temp = np.dot(xpt, x)
+        temp *= temp
+        qx += 0.5 * np.dot(self._pq, temp)
         if self._hq is not None:
             # If the explicit part of the Hessian matrix is not defined, it is
             # understood as the zero matrix. Therefore, if self.hq is None, the
             # second-order term is entirely defined by the implicit part of the
             # Hessian matrix of the quadratic function.
-            qx += 0.5 * np.inner(x, np.dot(self.hq, x))
+            qx += 0.5 * np.dot(x, np.dot(self._hq, x))
         return qx
 
     @property
@@ -4787,7 +5739,21 @@ def hq(self):
             return np.zeros((self.gq.size, self.gq.size), dtype=float)
         return self._hq
 
-    def grad(self, x, xpt, kopt):
+    @property
+    def hq_is_zero(self):
+        """
+        Whether the explicit part of the Hessian matrix of the model is zero.
+
+        Returns
+        -------
+        bool
+            Whether the explicit part of the Hessian matrix of the model is
+            not stored, in which case it is understood as the zero matrix and
+            its contributions to the evaluations of the model can be skipped.
+        """
+        return self._hq is None
+
+    def grad(self, x, xpt, kopt, out=None):
         """
         Evaluate the gradient of the quadratic function.
 
@@ -4803,13 +5769,20 @@ def grad(self, x, xpt, kopt):
             Index of the interpolation point around which the quadratic function
             is defined. The constant term of the quadratic function is not
             maintained, and zero is returned at ``xpt[kopt, :]``.
+        out : numpy.ndarray, shape (n,), optional
+            Array in which the result is stored. It must be a C-contiguous
+            array of floating-point numbers, which is returned.
 
         Returns
         -------
         numpy.ndarray, shape (n,)
             Value of the gradient of the quadratic function at `x`.
         """
-        return self.gq + self.hessp(x - xpt[kopt, :], xpt)
+        if _use_quad_ext(xpt):
+            return quad_grad(self._gq, self._pq, self._hq, x, xpt, kopt, out)
+        gx = self.hessp(x - xpt[kopt, :], xpt, out)
+        gx += self._gq
+        return gx
 
     def hess(self, xpt):
         """
@@ -4833,9 +5806,12 @@ def hess(self, xpt):
         Hessian matrix of the model with any vector are required, consider using
         instead `hessp`.
         """
-        return self.hq + np.matmul(xpt.T, self.pq[:, np.newaxis] * xpt)
+        hx = np.matmul(xpt.T, self._pq[:, np.newaxis] * xpt)
+        if self._hq is not None:
+            hx += self._hq
+        return hx
 
-    def hessp(self, x, xpt):
+    def hessp(self, x, xpt, out=None):
         """
         Evaluate the product of the Hessian matrix of the quadratic function
         with any vector.
@@ -4848,6 +5824,9 @@ def hessp(self, x, xpt):
         xpt : numpy.ndarray, shape (npt, n)
             Interpolation points that define the quadratic function. Each row of
             `xpt` stores the coordinates of an interpolation point.
+        out : numpy.ndarray, shape (n,), optional
+            Array in which the result is stored. It must be a C-contiguous
+            array of floating-point numbers, which is returned.
 
         Returns
         -------
@@ -4855,12 +5834,16 @@ def hessp(self, x, xpt):
             Value of the product of the Hessian matrix of the quadratic function
             with the vector `x`.
         """
-        hx = np.dot(xpt.T, self.pq * np.dot(xpt, x))
+        if _use_quad_ext(xpt):
+            return quad_hessp(self._pq, self._hq, x, xpt, out)
+        temp = np.dot(xpt, x)
+        temp *= self._pq
+        hx = np.dot(temp, xpt, out=out)
         if self._hq is not None:
             # If the explicit part of the Hessian matrix is not defined, it is
             # understood as the zero matrix. Therefore, if self.hq is None, the
             # Hessian matrix is entirely defined by its implicit part.
-            hx += np.dot(self.hq, x)
+            hx += np.dot(self._hq, x)
         return hx
 
     def curv(self, x, xpt):
@@ -4886,12 +5869,70 @@ def curv(self, x, xpt):
         Although the value can be recovered using `hessp`, the evaluation of
         this method improves the computational efficiency.
         """
-        cx = np.inner(self.pq, np.dot(xpt, x) ** 2.0)
+        if _use_quad_ext(xpt):
+            return quad_curv(self._pq, self._hq, x, xpt)
+        temp = np.dot(xpt, x)
+        temp *= temp
+        cx = np.dot(self._pq, temp)
         if self._hq is not None:
-            cx += np.inner(x, np.dot(self.hq, x))
+            cx += np.dot(x, np.dot(self._hq, x))
         return cx
 
-    def shift_expansion_point(self, step, xpt):
+    @classmethod
+    def from_arrays(cls, gq, pq, hq=None, copy=True):
+        """
+        Build a quadratic function from its stored components.
+
+        Parameters
+        ----------
+        gq : numpy.ndarray, shape (n,)
+            Gradient of the quadratic function at the point around which it is
+            defined.
+        pq : numpy.ndarray, shape (npt,)
+            Implicit part of the Hessian matrix of the quadratic function.
+        hq : numpy.ndarray, shape (n, n), optional
+            Explicit part of the Hessian matrix of the quadratic function. It
+            is understood as the zero matrix if it is not provided.
+        copy : bool, optional
+            Whether the arrays are to be copied (the default is True). If
+            False, the quadratic function holds the given arrays, and its
+            in-place updates modify them.
+
+        Returns
+        -------
+        Quadratic
+            Quadratic function defined by the given components.
+        """
+        model = cls.__new__(cls)
+        if copy:
+            model._gq = np.array(gq, dtype=float)
+            model._pq = np.array(pq, dtype=float)
+            model._hq = None if hq is None else np.array(hq, dtype=float,
+                                                          order='C')
+        else:
+            model._gq = gq
+            model._pq = pq
+            model._hq = hq
+        return model
+
+    def copy(self):
+        """
+        Copy the quadratic function.
+
+        Returns
+        -------
+        Quadratic
+            Copy of the quadratic function, whose arrays do not share memory
+            with those of the original quadratic function.
+
+        Notes
+        -----
+        The arrays of the quadratic function are copied directly, which is
+        significantly cheaper than the generic `copy.deepcopy`.
+        """
+        return self.from_arrays(self._gq, self._pq, self._hq)
+
+    def shift_expansion_point(self, step, xpt, hstep=None):
         """
         Shift the point around which the quadratic function is defined.
 
@@ -4909,10 +5950,20 @@ def shift_expansion_point(self, step, xpt):
         xpt : numpy.ndarray, shape (npt, n)
             Interpolation points that define the quadratic function. Each row of
             `xpt` stores the coordinates of an interpolation point.
+        hstep : numpy.ndarray, shape (n,), optional
+            Product of the Hessian matrix of the quadratic function with `step`,
+            if it has already been computed (for example, when several models
+            are shifted at once).
         """
-        self._gq += self.hessp(step, xpt)
+        if hstep is None:
+            if not np.any(step):
+                # The gradient is unchanged, and the product of the Hessian
+                # matrix with the step needs not to be evaluated.
+                return
+            hstep = self.hessp(step, xpt)
+        self._gq += hstep
 
-    def shift_interpolation_points(self, xpt, kopt):
+    def shift_interpolation_points(self, xpt, kopt, hxpq=None):
         """
         Update the components of the quadratic function when the origin from
         which the interpolation points are defined is to be displaced.
@@ -4926,17 +5977,34 @@ def shift_interpolation_points(self, xpt, kopt):
             Index of the interpolation point around which the quadratic function
             is defined. The constant term of the quadratic function is not
             maintained, and zero is returned at ``xpt[kopt, :]``.
+        hxpq : numpy.ndarray, shape (n,), optional
+            Product ``(xpt - 0.5 * xpt[kopt, :]).T @ pq``, if it has already
+            been computed (for example, when several models are shifted at
+            once).
 
         Notes
         -----
         Given ``xbase`` the previous origin of the calculations, it is assumed
         that the origin is shifted to ``xbase + xpt[kopt, :]``.
         """
-        hxpt = xpt - 0.5 * xpt[np.newaxis, kopt, :]
-        temp = np.outer(np.dot(hxpt.T, self.pq), xpt[kopt, :])
-        self._hq = self.hq + temp + temp.T
-
-    def update(self, xpt, kopt, xold, bmat, zmat, idz, knew, diff):
+        if hxpq is None:
+            hxpt = xpt - 0.5 * xpt[np.newaxis, kopt, :]
+            hxpq = np.dot(hxpt.T, self.pq)
+        if self._hq is None:
+            temp = np.outer(hxpq, xpt[kopt, :])
+            self._hq = temp + temp.T
+        else:
+            # The symmetric rank-two update is made in place by two rank-one
+            # updates of the transpose of the explicit part of the Hessian
+            # matrix, which avoids the allocation of the outer products.
+            hqt = self._hq.T
+            dger, = get_blas_funcs(('ger',), (hqt,))
+            hqt = dger(1.0, xpt[kopt, :], hxpq, a=hqt, overwrite_a=True)
+            hqt = dger(1.0, hxpq, xpt[kopt, :], a=hqt, overwrite_a=True)
+            self._hq = hqt.T
+
+    def update(self, xpt, kopt, xold, bmat, zmat, idz, knew, diff,
+               omega=None, glag=None):
         """
         Update the model when a point of the interpolation set is modified.
 
@@ -4966,19 +6034,80 @@ def update(self, xpt, kopt, xold, bmat, zmat, idz, knew, diff):
         diff : float
             Difference between the evaluation of the previous model and the
             expected value at ``xpt[kopt, :]``.
+        omega : numpy.ndarray, shape (npt,), optional
+            Implicit part of the Hessian matrix of the `knew`-th Lagrange
+            polynomial, if it has already been computed (for example, when
+            several models are updated at once).
+        glag : numpy.ndarray, shape (n,), optional
+            Gradient of the `knew`-th Lagrange polynomial at ``xpt[kopt, :]``,
+            if it has already been computed (see `lagrange_terms`).
         """
+        if omega is None or glag is None:
+            omega, glag = self.lagrange_terms(xpt, kopt, bmat, zmat, idz, knew)
+
         # Update the explicit and implicit parts of the Hessian matrix of the
         # quadratic function. The knew-th component of the implicit part of the
         # Hessian matrix is added to the explicit Hessian matrix. Then, the
-        # implicit part of the Hessian matrix is modified.
-        omega = implicit_hessian(zmat, idz, knew)
-        self._hq = self.hq + self.pq[knew] * np.outer(xold, xold)
+        # implicit part of the Hessian matrix is modified. The rank-one update
+        # of the explicit part is made in place if it is already stored.
+        if self._hq is None:
+            self._hq = self.pq[knew] * np.outer(xold, xold)
+        else:
+            hqt = self._hq.T
+            dger, = get_blas_funcs(('ger',), (hqt,))
+            self._hq = dger(self.pq[knew], xold, xold, a=hqt,
+                            overwrite_a=True).T
         self.pq[knew] = 0.0
         self._pq += diff * omega
 
         # Update the gradient of the model.
-        temp = omega * np.dot(xpt, xpt[kopt, :])
-        self._gq += diff * (bmat[knew, :] + np.dot(xpt.T, temp))
+        self._gq += diff * glag
+
+    @staticmethod
+    def lagrange_terms(xpt, kopt, bmat, zmat, idz, knew, xxopt=None):
+        """
+        Compute the terms of the `knew`-th Lagrange polynomial required to
+        update a quadratic function.
+
+        Parameters
+        ----------
+        xpt : numpy.ndarray, shape (npt, n)
+            Interpolation points that define the quadratic function. Each row of
+            `xpt` stores the coordinates of an interpolation point.
+        kopt : int
+            Index of the interpolation point around which the quadratic function
+            is defined.
+        bmat : numpy.ndarray, shape (npt + n, n)
+            Last ``n`` columns of the inverse KKT matrix of interpolation.
+        zmat : numpy.ndarray, shape (npt, npt - n - 1)
+            Rank factorization matrix of the leading ``npt`` submatrix of the
+            inverse KKT matrix of interpolation.
+        idz : int
+            Number of nonpositive eigenvalues of the leading ``npt`` submatrix
+            of the inverse KKT matrix of interpolation.
+        knew : int
+            Index of the interpolation point that is modified.
+        xxopt : numpy.ndarray, shape (npt,), optional
+            Products ``xpt @ xpt[kopt, :]``, if they have already been computed.
+
+        Returns
+        -------
+        numpy.ndarray, shape (npt,)
+            Implicit part of the Hessian matrix of the `knew`-th Lagrange
+            polynomial.
+        numpy.ndarray, shape (n,)
+            Gradient of the `knew`-th Lagrange polynomial at ``xpt[kopt, :]``.
+
+        Notes
+        -----
+        These terms do not depend on the quadratic function to be updated, so
+        that they can be shared by all the models updated at once.
+        """
+        omega = implicit_hessian(zmat, idz, knew)
+        if xxopt is None:
+            xxopt = np.dot(xpt, xpt[kopt, :])
+        glag = bmat[knew, :] + np.dot(xpt.T, omega * xxopt)
+        return omega, glag
 
     def check_model(self, xpt, fval, kopt, stack_level=2):
         """
@@ -5009,13 +6138,71 @@ def check_model(self, xpt, fval, kopt, stack_level=2):
             interpolation conditions up to a certain tolerance.
         """
         npt = fval.size
-        eps = np.finfo(float).eps
-        tol = 10.0 * np.sqrt(eps) * npt * np.max(np.abs(fval), initial=1.0)
-        diff = 0.0
-        for k in range(npt):
-            qx = self(xpt[k, :], xpt, kopt)
-            diff = max(diff, abs(qx + fval[kopt] - fval[k]))
+        tol = 10.0 * np.sqrt(_EPS) * npt * np.max(np.abs(fval), initial=1.0)
+
+        # Evaluate the quadratic function at all the interpolation points at
+        # once. The second-order terms are built from the products of the
+        # displacements from xpt[kopt, :] with the interpolation points.
+        step = xpt - xpt[kopt, :]
+        temp = np.dot(step, xpt.T)
+        temp *= temp
+        qx = np.dot(step, self._gq) + 0.5 * np.dot(temp, self._pq)
+        if self._hq is not None:
+            qx += 0.5 * np.sum(np.dot(step, self._hq) * step, axis=1)
+        diff = np.max(np.abs(qx + fval[kopt] - fval), initial=0.0)
         if diff > tol:
             stack_level += 1
             message = f'error in interpolation conditions is {diff:e}.'
             warnings.warn(message, RuntimeWarning, stacklevel=stack_level)
+
+
+def _evaluate(fun, cub, ceq, args, x):
+    """
+    Evaluate the objective and nonlinear constraint functions at a point.
+
+    This function is defined at the module level so that it can be pickled when
+    the evaluations are distributed among processes.
+
+    Parameters
+    ----------
+    fun : callable
+        Objective function.
+    cub : {callable, None}
+        Nonlinear inequality constraint function.
+    ceq : {callable, None}
+        Nonlinear equality constraint function.
+    args : tuple
+        Parameters to forward to the functions.
+    x : numpy.ndarray, shape (n,)
+        Point at which the functions are to be evaluated.
+
+    Returns
+    -------
+    tuple
+        Raw values of the objective function, of the nonlinear inequality
+        constraint function, and of the nonlinear equality constraint function
+        at `x`, the latter being None if the function is not provided.
+    """
+    fx = fun(x, *args)
+    cubx = None if cub is None else cub(x, *args)
+    ceqx = None if ceq is None else ceq(x, *args)
+    return fx, cubx, ceqx
+
+
+def _use_quad_ext(xpt):
+    """
+    Check whether the compiled kernels of the quadratic functions are to be
+    used for the given interpolation points.
+
+    Parameters
+    ----------
+    xpt : numpy.ndarray, shape (npt, n)
+        Interpolation points that define the quadratic functions.
+
+    Returns
+    -------
+    bool
+        Whether the compiled kernels are available and the problem is small
+        enough for them to outperform NumPy.
+    """
+    return quad_eval is not None and xpt.size <= _QUAD_EXT_MAX_SIZE
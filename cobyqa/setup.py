@@ -4,6 +4,7 @@
 
 
 def configuration(parent_package='', top_path=None):
+    import numpy as np
     from numpy.distutils.misc_util import Configuration
     config = Configuration('cobyqa', parent_package, top_path)
 
@@ -12,6 +13,18 @@ def configuration(parent_package='', top_path=None):
     config.add_subpackage('utils')
     config.add_data_dir('tests')
 
+    config.add_extension(
+        '_kkt',
+        sources=['_kkt.pyx'],
+        include_dirs=[np.get_include()],
+    )
+
+    config.add_extension(
+        '_quadratic',
+        sources=['_quadratic.pyx'],
+        include_dirs=[np.get_include()],
+    )
+
     # Skip cythonization when creating a source distribution.
     if 'sdist' not in sys.argv:
         cythonize_extensions(config)
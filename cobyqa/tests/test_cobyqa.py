@@ -1,102 +1,151 @@
 import re
 from abc import ABC
+from functools import lru_cache
 
 import numpy as np
 import pytest
-from numpy.testing import assert_, assert_allclose, assert_warns
+from numpy.testing import assert_, assert_allclose, assert_array_equal, \
+    assert_warns
 
-from cobyqa import minimize
+from cobyqa import minimize, optimize
 
 
-class TestBase(ABC):
+@lru_cache(maxsize=32)
+def _arange1(n):
+    nrg = np.arange(1.0, n + 1.0)
+    nrg.setflags(write=False)
+    return nrg
 
-    @staticmethod
-    def arwhead(x):
-        x = np.asarray(x)
-        fvx = (x[:-1] ** 2.0 + x[-1] ** 2.0) ** 2.0 - 4.0 * x[:-1] + 3.0
-        return np.sum(fvx)
 
-    @staticmethod
-    def perm0d(x):
-        x = np.asarray(x)
-        n = x.size
-        nrg = np.arange(1, n + 1)
-        fx = 0.0
-        for i in range(n):
-            fx += np.sum((nrg + 10.0) * (x ** i - 1.0 / nrg ** i)) ** 2.0
-        return fx
+def _trailing_zero(n, val=1.0):
+    xtz = np.full(n, val)
+    xtz[-1] = 0.0
+    return xtz
 
-    @staticmethod
-    def permd(x):
-        x = np.asarray(x)
-        n = x.size
-        nrg = np.arange(1, n + 1)
-        fx = 0.0
-        for i in range(n):
-            fx += np.sum((nrg ** i + 0.5) * ((x / nrg) ** i - 1.0)) ** 2.0
-        return fx
 
-    @staticmethod
-    def powell(x):
-        x = np.asarray(x)
-        n = x.size
-        fx = 10.0 * (x[-4] - x[-1]) ** 4.0 if n % 4 == 0 else 0.0
-        for i in range(n - 1):
-            if i % 4 == 0:
-                fx += (x[i] + 10.0 * x[i + 1]) ** 2.0
-            elif i % 4 == 1:
-                fx += (x[i] - 2.0 * x[i + 1]) ** 4.0
-            elif i % 4 == 2:
-                fx += 5.0 * (x[i] - x[i + 1]) ** 2.0
-            else:
-                fx += 10.0 * (x[i - 3] - x[i]) ** 4.0
-        return fx
+def _ceq_sum(x):
+    return np.sum(x) - 1.0
 
-    @staticmethod
-    def power(x):
-        x = np.asarray(x)
-        n = x.size
-        return np.sum(np.arange(1, n + 1) * x ** 2.0)
 
-    @staticmethod
-    def rosen(x):
-        x = np.asarray(x)
-        fvx = 100.0 * (x[1:] - x[:-1] ** 2.0) ** 2.0 + (1.0 - x[:-1]) ** 2.0
-        return np.sum(fvx)
+def _cub_sum(x):
+    return 1.0 - np.sum(x)
 
-    @staticmethod
-    def rothyp(x):
-        x = np.asarray(x)
-        n = x.size
-        return np.sum(np.arange(n, 0, -1) * x ** 2.0)
 
-    @staticmethod
-    def sphere(x):
-        x = np.asarray(x)
-        return np.inner(x, x)
+def arwhead(x):
+    x = np.asarray(x)
+    fvx = x[:-1] * x[:-1]
+    fvx += x[-1] * x[-1]
+    fvx *= fvx
+    return np.sum(fvx) - 4.0 * np.sum(x[:-1]) + 3.0 * (x.size - 1)
 
-    @staticmethod
-    def stybtang(x):
-        x = np.asarray(x)
-        return 0.5 * np.sum(x ** 4.0 - 16.0 * x ** 2.0 + 5.0 * x)
 
-    @staticmethod
-    def sumpow(x):
-        x = np.asarray(x)
-        n = x.size
-        return np.sum(np.abs(x) ** np.arange(2, n + 2))
+def perm0d(x):
+    x = np.asarray(x)
+    n = x.size
+    nrg = _arange1(n)
+    xpow = np.vander(x, n, True) - np.vander(1.0 / nrg, n, True)
+    fvx = np.dot(nrg + 10.0, xpow)
+    return np.inner(fvx, fvx)
 
-    @staticmethod
-    def trid(x):
-        x = np.asarray(x)
-        return np.sum((x - 1.0) ** 2.0) - np.sum(x[1:] * x[:-1])
 
-    @staticmethod
-    def zakharov(x):
-        x = np.asarray(x)
-        n = x.size
-        swi = 0.5 * np.sum(np.arange(1, n + 1) * x)
-        return np.inner(x, x) + swi ** 2.0 + swi ** 4.0
+def permd(x):
+    x = np.asarray(x)
+    n = x.size
+    nrg = _arange1(n)
+    xpow = np.vander(x / nrg, n, True) - 1.0
+    fvx = np.sum((np.vander(nrg, n, True) + 0.5) * xpow, axis=0)
+    return np.inner(fvx, fvx)
+
+
+def powell(x):
+    x = np.asarray(x)
+    n = x.size
+    fx = 10.0 * (x[-4] - x[-1]) ** 4.0 if n % 4 == 0 else 0.0
+    fx += np.sum((x[0:-1:4] + 10.0 * x[1::4]) ** 2.0)
+    fx += np.sum((x[1:-1:4] - 2.0 * x[2::4]) ** 4.0)
+    fx += 5.0 * np.sum((x[2:-1:4] - x[3::4]) ** 2.0)
+    fx += 10.0 * np.sum((x[0:-4:4] - x[3:-1:4]) ** 4.0)
+    return fx
+
+
+def power(x):
+    x = np.asarray(x)
+    n = x.size
+    return _arange1(n) @ (x * x)
+
+
+def rosen(x):
+    x = np.asarray(x)
+    xdf = x[1:] - x[:-1] * x[:-1]
+    xsh = 1.0 - x[:-1]
+    return 100.0 * (xdf @ xdf) + xsh @ xsh
+
+
+def rothyp(x):
+    x = np.asarray(x)
+    n = x.size
+    return np.sum(np.arange(n, 0, -1) * x ** 2.0)
+
+
+def sphere(x):
+    x = np.asarray(x)
+    return x @ x
+
+
+def stybtang(x):
+    x = np.asarray(x)
+    return 0.5 * np.sum(x ** 4.0 - 16.0 * x ** 2.0 + 5.0 * x)
+
+
+def sumpow(x):
+    x = np.asarray(x)
+    n = x.size
+    return np.sum(np.abs(x) ** np.arange(2, n + 2))
+
+
+def trid(x):
+    x = np.asarray(x)
+    xsh = x - 1.0
+    return xsh @ xsh - x[1:] @ x[:-1]
+
+
+def zakharov(x):
+    x = np.asarray(x)
+    n = x.size
+    swi = 0.5 * (_arange1(n) @ x)
+    swi *= swi
+    return x @ x + swi + swi * swi
+
+
+class TestBase(ABC):
+
+    arwhead = staticmethod(arwhead)
+    perm0d = staticmethod(perm0d)
+    permd = staticmethod(permd)
+    powell = staticmethod(powell)
+    power = staticmethod(power)
+    rosen = staticmethod(rosen)
+    rothyp = staticmethod(rothyp)
+    sphere = staticmethod(sphere)
+    stybtang = staticmethod(stybtang)
+    sumpow = staticmethod(sumpow)
+    trid = staticmethod(trid)
+    zakharov = staticmethod(zakharov)
+
+    _FUNCS = {
+        'arwhead': arwhead.__func__,
+        'perm0d': perm0d.__func__,
+        'permd': permd.__func__,
+        'powell': powell.__func__,
+        'power': power.__func__,
+        'rosen': rosen.__func__,
+        'rothyp': rothyp.__func__,
+        'sphere': sphere.__func__,
+        'stybtang': stybtang.__func__,
+        'sumpow': sumpow.__func__,
+        'trid': trid.__func__,
+        'zakharov': zakharov.__func__,
+    }
 
     @staticmethod
     def _unstable(fun, x):
@@ -111,9 +160,9 @@ def __getattr__(self, item):
         stable = unstable.match(item)
         if stable:
             try:
-                fun = getattr(self, stable.group('fun'))
+                fun = self._FUNCS[stable.group('fun')]
                 return lambda x: self._unstable(fun, x)
-            except AttributeError as exc:
+            except KeyError as exc:
                 raise AttributeError(item) from exc
         else:
             raise AttributeError(item)
@@ -129,63 +178,100 @@ def assert_optimize(res, n, x_sol, f_sol, status=0, maxcv=False):
             if maxcv:
                 assert_allclose(res.maxcv, 0.0, atol=1e-3)
 
+    @staticmethod
+    def assert_history(res, n):
+        assert_(res.xhist.shape == (res.nfev, n))
+        assert_(res.fhist.shape == (res.nfev,))
+        assert_(res.maxcvhist.shape == (res.nfev,))
+        fhist = np.where(res.maxcvhist <= res.maxcv, res.fhist, np.inf)
+        assert_allclose(res.fhist[np.argmin(fhist)], res.fun)
+
+    @staticmethod
+    def assert_workers(fun, x0, workers, **kwargs):
+        # Every call to the objective function must be counted and recorded,
+        # even if the target is reached during the concurrent evaluations.
+        ref = minimize(fun, x0, store_history=True, **kwargs)
+        calls = []
+
+        def fun_calls(x):
+            calls.append(None)
+            return fun(x)
+
+        options = dict(kwargs.pop('options', {}), workers=workers)
+        res = minimize(fun_calls, x0, options=options, store_history=True,
+                       **kwargs)
+        assert_(res.nfev == len(calls))
+        assert_(res.fhist.size == res.nfev)
+        assert_(res.status == ref.status)
+        return ref, res
+
+    @pytest.fixture(params=['compiled', 'numpy'])
+    def kernels(self, request, monkeypatch):
+        # Disable the compiled kernels to exercise the NumPy implementations,
+        # which are otherwise never run when the extensions are built.
+        if request.param == 'numpy':
+            monkeypatch.setattr(optimize, 'beta_vlag', None)
+            monkeypatch.setattr(optimize, 'givens_sweep', None)
+            monkeypatch.setattr(optimize, 'quad_eval', None)
+        return request.param
+
     @pytest.fixture
     def x0(self, fun, n):
-        return {
-            'arwhead': np.zeros(n),
-            'perm0d': np.ones(n),
-            'permd': np.ones(n),
-            'powell': np.ones(n),
-            'power': np.ones(n),
-            'rosen': 0.5 * np.ones(n),
-            'rothyp': np.ones(n),
-            'sphere': np.ones(n),
-            'stybtang': -np.ones(n),
-            'sumpow': np.ones(n),
-            'trid': np.zeros(n),
-            'zakharov': np.ones(n),
-        }.get(fun)
+        return np.full(n, {
+            'arwhead': 0.0,
+            'perm0d': 1.0,
+            'permd': 1.0,
+            'powell': 1.0,
+            'power': 1.0,
+            'rosen': 0.5,
+            'rothyp': 1.0,
+            'sphere': 1.0,
+            'stybtang': -1.0,
+            'sumpow': 1.0,
+            'trid': 0.0,
+            'zakharov': 1.0,
+        }[fun], dtype=float)
 
     @pytest.fixture
     def xl(self, fun, n):
-        return {
-            'arwhead': -5.12 * np.ones(n),
-            'perm0d': -n * np.ones(n),
-            'permd': -n * np.ones(n),
-            'powell': -4.0 * np.ones(n),
-            'power': -5.12 * np.ones(n),
-            'rosen': -2.048 * np.ones(n),
-            'rothyp': -65.536 * np.ones(n),
-            'sphere': -5.12 * np.ones(n),
-            'stybtang': -5.0 * np.ones(n),
-            'sumpow': -np.ones(n),
-            'trid': -n ** 2.0 * np.ones(n),
-            'zakharov': -5.0 * np.ones(n),
-        }.get(fun)
+        return np.full(n, {
+            'arwhead': -5.12,
+            'perm0d': -n,
+            'permd': -n,
+            'powell': -4.0,
+            'power': -5.12,
+            'rosen': -2.048,
+            'rothyp': -65.536,
+            'sphere': -5.12,
+            'stybtang': -5.0,
+            'sumpow': -1.0,
+            'trid': -n ** 2.0,
+            'zakharov': -5.0,
+        }[fun], dtype=float)
 
     @pytest.fixture
     def xu(self, fun, n):
-        return {
-            'arwhead': 5.12 * np.ones(n),
-            'perm0d': n * np.ones(n),
-            'permd': n * np.ones(n),
-            'powell': 3.0 * np.ones(n),
-            'power': 5.12 * np.ones(n),
-            'rosen': 2.048 * np.ones(n),
-            'rothyp': 65.536 * np.ones(n),
-            'sphere': 5.12 * np.ones(n),
-            'stybtang': 5.0 * np.ones(n),
-            'sumpow': np.ones(n),
-            'trid': n ** 2.0 * np.ones(n),
-            'zakharov': 10.0 * np.ones(n),
-        }.get(fun)
+        return np.full(n, {
+            'arwhead': 5.12,
+            'perm0d': n,
+            'permd': n,
+            'powell': 3.0,
+            'power': 5.12,
+            'rosen': 2.048,
+            'rothyp': 65.536,
+            'sphere': 5.12,
+            'stybtang': 5.0,
+            'sumpow': 1.0,
+            'trid': n ** 2.0,
+            'zakharov': 10.0,
+        }[fun], dtype=float)
 
     @pytest.fixture
     def x_sol(self, fun, n):
         return {
-            'arwhead': np.r_[np.ones(n - 1), 0.0],
-            'perm0d': 1.0 / np.arange(1, n + 1),
-            'permd': np.arange(1, n + 1),
+            'arwhead': _trailing_zero(n),
+            'perm0d': 1.0 / _arange1(n),
+            'permd': _arange1(n),
             'powell': np.zeros(n),
             'power': np.zeros(n),
             'rosen': np.ones(n),
@@ -193,7 +279,7 @@ def x_sol(self, fun, n):
             'sphere': np.zeros(n),
             'stybtang': -2.90353402777118 * np.ones(n),
             'sumpow': np.zeros(n),
-            'trid': np.arange(1, n + 1) * np.arange(n, 0, -1),
+            'trid': _arange1(n) * np.arange(n, 0, -1),
             'zakharov': np.zeros(n),
         }.get(fun)
 
@@ -225,9 +311,9 @@ def get_npt(self, n, npt):
     @pytest.mark.parametrize('n', [2, 5, 10])
     @pytest.mark.parametrize('fun', ['arwhead', 'power', 'rosen', 'rothyp',
                                      'sphere', 'stybtang', 'trid'])
-    def test_simple(self, fun, n, x0, x_sol, f_sol):
+    def test_simple(self, fun, n, kernels, x0, x_sol, f_sol):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             options={'debug': True},
         )
@@ -247,9 +333,9 @@ def test_unstable(self, fun, n, x0, x_sol, f_sol):
                                      'sphere', 'stybtang', 'trid'])
     def test_target(self, fun, n, x0, x_sol, f_sol):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
-            options={'debug': True, 'target': f_sol + 1.0},
+            options={'target': f_sol + 1.0},
         )
         self.assert_optimize(res, n, x_sol, f_sol, 1)
 
@@ -258,76 +344,88 @@ def test_target(self, fun, n, x0, x_sol, f_sol):
                                      'sphere', 'stybtang', 'trid'])
     def test_options(self, fun, n, x0, x_sol, f_sol):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
         )
         self.assert_optimize(res, n, x_sol, f_sol)
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
-            options={'rhobeg': 1.5, 'debug': True},
+            options={'rhobeg': 1.5},
         )
         self.assert_optimize(res, n, x_sol, f_sol)
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
-            options={'rhoend': 1e-7, 'debug': True},
+            options={'rhoend': 1e-7},
         )
         self.assert_optimize(res, n, x_sol, f_sol)
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
-            options={'npt': self.get_npt(n, n + 3), 'debug': True},
+            options={'npt': self.get_npt(n, n + 3)},
         )
         self.assert_optimize(res, n, x_sol, f_sol)
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
-            options={'npt': self.get_npt(n, n + 3), 'debug': True},
+            options={'npt': self.get_npt(n, n + 3)},
         )
         self.assert_optimize(res, n, x_sol, f_sol)
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
-            options={'maxfev': 300 * n, 'debug': True},
+            options={'maxfev': 300 * n},
         )
         self.assert_optimize(res, n, x_sol, f_sol)
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
-            options={'maxiter': 500 * n, 'debug': True},
+            options={'maxiter': 500 * n},
         )
         self.assert_optimize(res, n, x_sol, f_sol)
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
-            options={'disp': True, 'debug': True},
+            options={'disp': True},
         )
         self.assert_optimize(res, n, x_sol, f_sol)
         with assert_warns(RuntimeWarning):
             minimize(
-                fun=getattr(self, fun),
+                fun=self._FUNCS[fun],
                 x0=x0,
                 options={'npt': n},
             )
         with assert_warns(RuntimeWarning):
             minimize(
-                fun=getattr(self, fun),
+                fun=self._FUNCS[fun],
                 x0=x0,
                 options={'npt': (n + 2) ** 2.0 // 2},
             )
         with assert_warns(RuntimeWarning):
             minimize(
-                fun=getattr(self, fun),
+                fun=self._FUNCS[fun],
                 x0=x0,
                 options={'maxfev': n},
             )
         with assert_warns(RuntimeWarning):
             minimize(
-                fun=getattr(self, fun),
+                fun=self._FUNCS[fun],
                 x0=x0,
                 options={'rhobeg': 1e-3, 'rhoend': 1e-2},
             )
+        with assert_warns(RuntimeWarning):
+            minimize(
+                fun=self._FUNCS[fun],
+                x0=x0,
+                options={'workers': 0},
+            )
+        with assert_warns(RuntimeWarning):
+            minimize(
+                fun=self._FUNCS[fun],
+                x0=x0,
+                options={'workers': 2.5},
+            )
 
 
 class TestBoundConstrained(TestBase):
@@ -335,23 +433,23 @@ class TestBoundConstrained(TestBase):
     @pytest.fixture
     def xl2(self, fun, n):
         return {
-            'arwhead': -0.5 * np.ones(n),
-            'power': 0.5 * np.ones(n),
+            'arwhead': np.full(n, -0.5),
+            'power': np.full(n, 0.5),
             'sphere': np.arange(n),
         }.get(fun)
 
     @pytest.fixture
     def xu2(self, fun, n):
         return {
-            'arwhead': 0.5 * np.ones(n),
+            'arwhead': np.full(n, 0.5),
             'power': np.ones(n),
-            'sphere': 2.0 * n * np.ones(n),
+            'sphere': np.full(n, 2.0 * n),
         }.get(fun)
 
     @pytest.fixture
     def x_sol2(self, fun, n):
         return {
-            'arwhead': np.r_[0.5 * np.ones(n - 1), 0.0],
+            'arwhead': _trailing_zero(n, 0.5),
             'power': 0.5 * np.ones(n),
             'sphere': np.arange(n),
         }.get(fun)
@@ -367,9 +465,9 @@ def f_sol2(self, fun, n):
     @pytest.mark.parametrize('n', [2, 5, 10])
     @pytest.mark.parametrize('fun', ['arwhead', 'power', 'rosen', 'rothyp',
                                      'sphere', 'stybtang', 'trid'])
-    def test_simple(self, fun, n, x0, xl, xu, x_sol, f_sol):
+    def test_simple(self, fun, n, kernels, x0, xl, xu, x_sol, f_sol):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xu,
@@ -393,11 +491,11 @@ def test_unstable(self, fun, n, x0, xl, xu, x_sol, f_sol):
                                      'sphere', 'stybtang', 'trid'])
     def test_target(self, fun, n, x0, xl, xu, x_sol, f_sol):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xu,
-            options={'debug': True, 'target': f_sol + 1.0},
+            options={'target': f_sol + 1.0},
         )
         self.assert_optimize(res, n, x_sol, f_sol, 1, True)
 
@@ -405,11 +503,10 @@ def test_target(self, fun, n, x0, xl, xu, x_sol, f_sol):
     @pytest.mark.parametrize('fun', ['arwhead', 'power', 'sphere'])
     def test_restricted(self, fun, n, x0, xl2, xu2, x_sol2, f_sol2):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl2,
             xu=xu2,
-            options={'debug': True},
         )
         self.assert_optimize(res, n, x_sol2, f_sol2, maxcv=True)
 
@@ -418,11 +515,10 @@ def test_restricted(self, fun, n, x0, xl2, xu2, x_sol2, f_sol2):
                                      'sphere', 'stybtang', 'trid'])
     def test_fixed(self, fun, n, x0, xl):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xl,
-            options={'debug': True},
         )
         assert_(res.status == 9)
         assert_(res.success, res.message)
@@ -433,7 +529,7 @@ class TestLinearEqualityConstrained(TestBase):
     @pytest.fixture
     def aeq(self, fun, n):
         return {
-            'arwhead': np.c_[np.ones((1, n - 1)), 0.0],
+            'arwhead': _trailing_zero(n)[np.newaxis, :],
             'power': np.ones((1, n)),
             'sphere': np.ones((1, n)),
         }.get(fun)
@@ -448,9 +544,9 @@ def beq(self, fun):
 
     @pytest.fixture
     def x_sol(self, fun, n):
-        nrg = np.arange(1, n + 1)
+        nrg = _arange1(n)
         return {
-            'arwhead': np.r_[(1.0 / (n - 1.0)) * np.ones(n - 1), 0.0],
+            'arwhead': _trailing_zero(n, 1.0 / (n - 1.0)),
             'power': (1.0 / np.sum(1.0 / nrg)) / nrg,
             'sphere': (1.0 / n) * np.ones(n),
         }.get(fun)
@@ -459,15 +555,15 @@ def x_sol(self, fun, n):
     def f_sol(self, fun, n):
         return {
             'arwhead': 1.0 / (n - 1.0) ** 3.0 + 3.0 * (n - 1.0) - 4.0,
-            'power': 1.0 / np.sum(1.0 / np.arange(1, n + 1)),
+            'power': 1.0 / np.sum(1.0 / _arange1(n)),
             'sphere': 1.0 / n
         }.get(fun)
 
     @pytest.mark.parametrize('n', [2, 5, 10])
     @pytest.mark.parametrize('fun', ['arwhead', 'power', 'sphere'])
-    def test_simple(self, fun, n, x0, xl, xu, aeq, beq, x_sol, f_sol):
+    def test_simple(self, fun, n, kernels, x0, xl, xu, aeq, beq, x_sol, f_sol):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             Aeq=aeq,
             beq=beq,
@@ -476,7 +572,7 @@ def test_simple(self, fun, n, x0, xl, xu, aeq, beq, x_sol, f_sol):
         self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             Aeq=aeq,
             beq=beq,
@@ -486,7 +582,7 @@ def test_simple(self, fun, n, x0, xl, xu, aeq, beq, x_sol, f_sol):
         self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xu,
@@ -497,7 +593,7 @@ def test_simple(self, fun, n, x0, xl, xu, aeq, beq, x_sol, f_sol):
         self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xu,
@@ -531,22 +627,22 @@ def test_unstable(self, fun, n, x0, xl, xu, aeq, beq, x_sol, f_sol):
     @pytest.mark.parametrize('fun', ['arwhead', 'power', 'sphere'])
     def test_target(self, fun, n, x0, xl, xu, aeq, beq, x_sol, f_sol):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             Aeq=aeq,
             beq=beq,
-            options={'debug': True, 'target': f_sol + 1.0},
+            options={'target': f_sol + 1.0},
         )
         self.assert_optimize(res, n, x_sol, f_sol, 1, True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xu,
             Aeq=aeq,
             beq=beq,
-            options={'debug': True, 'target': f_sol + 1.0},
+            options={'target': f_sol + 1.0},
         )
         self.assert_optimize(res, n, x_sol, f_sol, 1, True)
 
@@ -569,7 +665,7 @@ def bub(self, fun):
 
     @pytest.fixture
     def x_sol(self, fun, n):
-        nrg = np.arange(1, n + 1)
+        nrg = _arange1(n)
         return {
             'power': (1.0 / np.sum(1.0 / nrg)) / nrg,
             'sphere': (1.0 / n) * np.ones(n),
@@ -578,15 +674,15 @@ def x_sol(self, fun, n):
     @pytest.fixture
     def f_sol(self, fun, n):
         return {
-            'power': 1.0 / np.sum(1.0 / np.arange(1, n + 1)),
+            'power': 1.0 / np.sum(1.0 / _arange1(n)),
             'sphere': 1.0 / n
         }.get(fun)
 
     @pytest.mark.parametrize('n', [2, 5, 10])
     @pytest.mark.parametrize('fun', ['power', 'sphere'])
-    def test_simple(self, fun, n, x0, xl, xu, aub, bub, x_sol, f_sol):
+    def test_simple(self, fun, n, kernels, x0, xl, xu, aub, bub, x_sol, f_sol):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             Aub=aub,
             bub=bub,
@@ -595,7 +691,7 @@ def test_simple(self, fun, n, x0, xl, xu, aub, bub, x_sol, f_sol):
         self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             Aub=aub,
             bub=bub,
@@ -605,7 +701,7 @@ def test_simple(self, fun, n, x0, xl, xu, aub, bub, x_sol, f_sol):
         self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xu,
@@ -616,7 +712,7 @@ def test_simple(self, fun, n, x0, xl, xu, aub, bub, x_sol, f_sol):
         self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xu,
@@ -650,22 +746,22 @@ def test_unstable(self, fun, n, x0, xl, xu, aub, bub, x_sol, f_sol):
     @pytest.mark.parametrize('fun', ['power', 'sphere'])
     def test_target(self, fun, n, x0, xl, xu, aub, bub, x_sol, f_sol):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             Aub=aub,
             bub=bub,
-            options={'debug': True, 'target': f_sol + 1.0},
+            options={'target': f_sol + 1.0},
         )
         self.assert_optimize(res, n, x_sol, f_sol, 1, True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xu,
             Aub=aub,
             bub=bub,
-            options={'debug': True, 'target': f_sol + 1.0},
+            options={'target': f_sol + 1.0},
         )
         self.assert_optimize(res, n, x_sol, f_sol, 1, True)
 
@@ -674,9 +770,9 @@ class TestNonlinearEqualityConstrained(TestBase):
 
     @staticmethod
     def ceq_base(fun):
-        return lambda x: {
-            'power': np.sum(x) - 1.0,
-            'sphere': np.sum(x) - 1.0,
+        return {
+            'power': _ceq_sum,
+            'sphere': _ceq_sum,
         }.get(fun)
 
     @pytest.fixture
@@ -689,7 +785,7 @@ def ceq_unstable(self, fun):
 
     @pytest.fixture
     def x_sol(self, fun, n):
-        nrg = np.arange(1, n + 1)
+        nrg = _arange1(n)
         return {
             'power': (1.0 / np.sum(1.0 / nrg)) / nrg,
             'sphere': (1.0 / n) * np.ones(n),
@@ -698,15 +794,15 @@ def x_sol(self, fun, n):
     @pytest.fixture
     def f_sol(self, fun, n):
         return {
-            'power': 1.0 / np.sum(1.0 / np.arange(1, n + 1)),
+            'power': 1.0 / np.sum(1.0 / _arange1(n)),
             'sphere': 1.0 / n
         }.get(fun)
 
     @pytest.mark.parametrize('n', [2, 5, 10])
     @pytest.mark.parametrize('fun', ['power', 'sphere'])
-    def test_simple(self, fun, n, x0, xl, xu, ceq, x_sol, f_sol):
+    def test_simple(self, fun, n, kernels, x0, xl, xu, ceq, x_sol, f_sol):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             ceq=ceq,
             options={'debug': True},
@@ -714,7 +810,7 @@ def test_simple(self, fun, n, x0, xl, xu, ceq, x_sol, f_sol):
         self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             ceq=ceq,
             options={'debug': True},
@@ -723,7 +819,7 @@ def test_simple(self, fun, n, x0, xl, xu, ceq, x_sol, f_sol):
         self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xu,
@@ -733,7 +829,7 @@ def test_simple(self, fun, n, x0, xl, xu, ceq, x_sol, f_sol):
         self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xu,
@@ -764,31 +860,61 @@ def test_unstable(self, fun, n, x0, xl, xu, ceq_unstable, x_sol, f_sol):
     @pytest.mark.parametrize('fun', ['power', 'sphere'])
     def test_target(self, fun, n, x0, xl, xu, ceq, x_sol, f_sol):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             ceq=ceq,
-            options={'debug': True, 'target': f_sol + 1.0},
+            options={'target': f_sol + 1.0},
         )
         self.assert_optimize(res, n, x_sol, f_sol, 1, True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xu,
             ceq=ceq,
-            options={'debug': True, 'target': f_sol + 1.0},
+            options={'target': f_sol + 1.0},
         )
         self.assert_optimize(res, n, x_sol, f_sol, 1, True)
 
+    @pytest.mark.parametrize('n', [2, 5, 10])
+    @pytest.mark.parametrize('fun', ['power', 'sphere'])
+    def test_history(self, fun, n, x0, ceq, x_sol, f_sol):
+        res = minimize(
+            fun=self._FUNCS[fun],
+            x0=x0,
+            ceq=ceq,
+            store_history=True,
+        )
+        self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
+        self.assert_history(res, n)
+
+    @pytest.mark.parametrize('workers', [2, map])
+    @pytest.mark.parametrize('n', [2, 5, 10])
+    @pytest.mark.parametrize('fun', ['power', 'sphere'])
+    def test_workers(self, fun, n, workers, x0, ceq, x_sol, f_sol):
+        ref, res = self.assert_workers(
+            self._FUNCS[fun],
+            x0,
+            workers,
+            ceq=ceq,
+        )
+        self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
+
+        # The values evaluated concurrently are gathered by index, so that the
+        # results must match the sequential ones.
+        assert_array_equal(res.x, ref.x)
+        assert_(res.fun == ref.fun)
+        assert_(res.nfev == ref.nfev)
+
 
 class TestNonlinearInequalityConstrained(TestBase):
 
     @staticmethod
     def cub_base(fun):
-        return lambda x: {
-            'power': 1.0 - np.sum(x),
-            'sphere': 1.0 - np.sum(x),
+        return {
+            'power': _cub_sum,
+            'sphere': _cub_sum,
         }.get(fun)
 
     @pytest.fixture
@@ -801,7 +927,7 @@ def cub_unstable(self, fun):
 
     @pytest.fixture
     def x_sol(self, fun, n):
-        nrg = np.arange(1, n + 1)
+        nrg = _arange1(n)
         return {
             'power': (1.0 / np.sum(1.0 / nrg)) / nrg,
             'sphere': (1.0 / n) * np.ones(n),
@@ -810,15 +936,15 @@ def x_sol(self, fun, n):
     @pytest.fixture
     def f_sol(self, fun, n):
         return {
-            'power': 1.0 / np.sum(1.0 / np.arange(1, n + 1)),
+            'power': 1.0 / np.sum(1.0 / _arange1(n)),
             'sphere': 1.0 / n
         }.get(fun)
 
     @pytest.mark.parametrize('n', [2, 5, 10])
     @pytest.mark.parametrize('fun', ['power', 'sphere'])
-    def test_simple(self, fun, n, x0, xl, xu, cub, x_sol, f_sol):
+    def test_simple(self, fun, n, kernels, x0, xl, xu, cub, x_sol, f_sol):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             cub=cub,
             options={'debug': True},
@@ -826,7 +952,7 @@ def test_simple(self, fun, n, x0, xl, xu, cub, x_sol, f_sol):
         self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             cub=cub,
             options={'debug': True},
@@ -835,7 +961,7 @@ def test_simple(self, fun, n, x0, xl, xu, cub, x_sol, f_sol):
         self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xu,
@@ -845,7 +971,7 @@ def test_simple(self, fun, n, x0, xl, xu, cub, x_sol, f_sol):
         self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xu,
@@ -876,19 +1002,81 @@ def test_unstable(self, fun, n, x0, xl, xu, cub_unstable, x_sol, f_sol):
     @pytest.mark.parametrize('fun', ['power', 'sphere'])
     def test_target(self, fun, n, x0, xl, xu, cub, x_sol, f_sol):
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             cub=cub,
-            options={'debug': True, 'target': f_sol + 1.0},
+            options={'target': f_sol + 1.0},
         )
         self.assert_optimize(res, n, x_sol, f_sol, 1, True)
 
         res = minimize(
-            fun=getattr(self, fun),
+            fun=self._FUNCS[fun],
             x0=x0,
             xl=xl,
             xu=xu,
             cub=cub,
-            options={'debug': True, 'target': f_sol + 1.0},
+            options={'target': f_sol + 1.0},
         )
         self.assert_optimize(res, n, x_sol, f_sol, 1, True)
+
+    @pytest.mark.parametrize('n', [2, 5, 10])
+    @pytest.mark.parametrize('fun', ['power', 'sphere'])
+    def test_history(self, fun, n, x0, xl, xu, cub, x_sol, f_sol):
+        res = minimize(
+            fun=self._FUNCS[fun],
+            x0=x0,
+            cub=cub,
+            store_history=True,
+        )
+        self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
+        self.assert_history(res, n)
+
+        # The variables fixed by the bound constraints must be included in
+        # the history of the points.
+        xl[0] = xu[0] = x0[0]
+        res = minimize(
+            fun=self._FUNCS[fun],
+            x0=x0,
+            xl=xl,
+            xu=xu,
+            cub=cub,
+            store_history=True,
+        )
+        self.assert_history(res, n)
+        assert_(np.all(res.xhist[:, 0] == x0[0]))
+        assert_allclose(res.xhist[0, :], x0)
+
+    @pytest.mark.parametrize('workers', [2, map])
+    @pytest.mark.parametrize('n', [2, 5, 10])
+    @pytest.mark.parametrize('fun', ['power', 'sphere'])
+    def test_workers(self, fun, n, workers, x0, cub, x_sol, f_sol):
+        ref, res = self.assert_workers(
+            self._FUNCS[fun],
+            x0,
+            workers,
+            cub=cub,
+        )
+        self.assert_optimize(res, n, x_sol, f_sol, maxcv=True)
+
+        # The values evaluated concurrently are gathered by index, so that the
+        # results must match the sequential ones.
+        assert_array_equal(res.x, ref.x)
+        assert_(res.fun == ref.fun)
+        assert_(res.nfev == ref.nfev)
+
+        # The target is first reached at the feasible point x0 - e_1, which is
+        # evaluated concurrently with the remaining initial points. The best
+        # of them is then returned.
+        target = self._FUNCS[fun](x0) - 0.5
+        ref, res = self.assert_workers(
+            self._FUNCS[fun],
+            x0,
+            workers,
+            cub=cub,
+            options={'target': target},
+        )
+        assert_(res.status == 1)
+        assert_(ref.nfev == n + 2)
+        assert_(res.nfev == 2 * n + 1)
+        assert_(res.fun <= ref.fun)
+        assert_(res.fun == np.min(res.fhist))
@@ -20,14 +20,15 @@ def implicit_hessian(zmat, idz, x):
         Above-mentioned matrix `zmat`.
     idz : int
         Above-mentioned index `idz`.
-    x : int or numpy.ndarray, shape (npt,)
+    x : int or numpy.ndarray, shape (npt,) or (npt, m)
         Above-mentioned vector `x`. An integer value represents the
         ``npt``-dimensional vector whose components are all zero, except the
-        `x`-th one whose value is one.
+        `x`-th one whose value is one. If `x` is two-dimensional, the products
+        are computed for each of its columns at once.
 
     Returns
     -------
-    numpy.ndarray, shape (npt,)
+    numpy.ndarray, shape (npt,) or (npt, m)
         Product ``zmat @ np.c_[-zmat[:, :idz], zmat[:, idz:]].T @ x``.
     """
     if isinstance(x, (int, np.integer)):
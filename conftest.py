@@ -0,0 +1,24 @@
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--full',
+        action='store_true',
+        default=False,
+        help='run the tests on every problem dimension',
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    skip = pytest.mark.skip(reason='need --full option to run')
+    for item in items:
+        # Only the solver tests are restricted, as the tests of the linear
+        # algebra subroutines are cheap on every dimension.
+        if item.fspath.basename != 'test_cobyqa.py':
+            continue
+        callspec = getattr(item, 'callspec', None)
+        if callspec is not None and callspec.params.get('n', 5) != 5:
+            item.add_marker(pytest.mark.full)
+            if not config.getoption('--full'):
+                item.add_marker(skip)